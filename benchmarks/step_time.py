@@ -0,0 +1,170 @@
+"""
+Step-time benchmark for AntColonyModel.
+
+Builds seeded models over a matrix of grid sizes and worker counts, runs a fixed
+number of steps and reports per-step wall time, time per agent class and peak
+memory as JSON. Pass --baseline to compare against a previous results file.
+
+    python -m benchmarks.step_time --out bench.json
+    python -m benchmarks.step_time --baseline bench.json
+"""
+import argparse
+import json
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+
+import mesa
+
+from core.model import AntColonyModel
+from core.profiling import Profiler
+from core.agents.worker import WorkerAgent
+from core.agents.brood import BroodSchedule
+from core.agents.queen import QueenAgent
+from core.agents.drone import DroneAgent
+from core.world.food import FoodLayer
+from core.world.pheromone import PheromoneField
+
+DEFAULT_SIZES = [(50, 50), (100, 60), (200, 120)]
+DEFAULT_WORKERS = [15, 100, 500]
+
+# (label, owner class, method) timed in the per-class pass
+TIMED_METHODS = [
+    ("WorkerAgent", WorkerAgent, "step"),
+    ("Brood", BroodSchedule, "advance"),
+    ("Food", FoodLayer, "step"),
+    ("QueenAgent", QueenAgent, "step"),
+    ("DroneAgent", DroneAgent, "step"),
+    ("Pheromones", PheromoneField, "decay"),
+]
+
+
+def build_model(width, height, workers, seed):
+    return AntColonyModel(width=width, height=height, initial_workers=workers, seed=seed)
+
+
+def time_steps(model, steps):
+    """Returns per-step wall times in milliseconds."""
+    times = []
+    for _ in range(steps):
+        start = time.perf_counter()
+        model.step()
+        times.append((time.perf_counter() - start) * 1000.0)
+    return times
+
+
+def time_per_class(model, steps):
+    """Runs `steps` with TIMED_METHODS profiled and returns cumulative ms and calls per label."""
+    with Profiler(hooks=TIMED_METHODS) as profiler:
+        for _ in range(steps):
+            model.step()
+    return profiler.report()
+
+
+def peak_memory_kb(width, height, workers, steps, seed):
+    tracemalloc.start()
+    try:
+        model = build_model(width, height, workers, seed)
+        for _ in range(steps):
+            model.step()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak / 1024.0
+
+
+def run_case(width, height, workers, steps, seed):
+    """Each measurement uses a fresh model with the same seed, so all passes see one trajectory."""
+    step_ms = time_steps(build_model(width, height, workers, seed), steps)
+    model = build_model(width, height, workers, seed)
+    per_class = time_per_class(model, steps)
+    return {
+        "width": width,
+        "height": height,
+        "workers": workers,
+        "steps": steps,
+        "final_agents": len(model.agents),
+        "step_ms_mean": statistics.fmean(step_ms),
+        "step_ms_median": statistics.median(step_ms),
+        "step_ms_p95": sorted(step_ms)[int(0.95 * (len(step_ms) - 1))],
+        "per_class": per_class,
+        "peak_memory_kb": peak_memory_kb(width, height, workers, steps, seed),
+    }
+
+
+def run_benchmarks(sizes=DEFAULT_SIZES, workers=DEFAULT_WORKERS, steps=200, seed=42, log=print):
+    cases = []
+    for width, height in sizes:
+        for count in workers:
+            case = run_case(width, height, count, steps, seed)
+            log(f"{width}x{height} workers={count}: "
+                f"{case['step_ms_median']:.3f} ms/step median, "
+                f"{case['peak_memory_kb']:.0f} KiB peak")
+            cases.append(case)
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "mesa": mesa.__version__,
+            "platform": platform.platform(),
+            "steps": steps,
+            "seed": seed,
+        },
+        "cases": cases,
+    }
+
+
+def compare(results, baseline, threshold=0.10):
+    """
+    Matches cases by (width, height, workers) and returns a list of
+    (case key, baseline ms, current ms, ratio, regressed) rows.
+    """
+    def key(case):
+        return (case["width"], case["height"], case["workers"])
+
+    base_cases = {key(c): c for c in baseline["cases"]}
+    rows = []
+    for case in results["cases"]:
+        base = base_cases.get(key(case))
+        if base is None: continue
+        ratio = case["step_ms_median"] / base["step_ms_median"] if base["step_ms_median"] else float("inf")
+        rows.append((key(case), base["step_ms_median"], case["step_ms_median"], ratio, ratio > 1.0 + threshold))
+    return rows
+
+
+def parse_size(text):
+    width, _, height = text.partition("x")
+    return int(width), int(height or width)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark AntColonyModel.step across grid sizes and populations.")
+    parser.add_argument("--sizes", type=parse_size, nargs="+", default=DEFAULT_SIZES, help="grid sizes as WxH")
+    parser.add_argument("--workers", type=int, nargs="+", default=DEFAULT_WORKERS, help="initial worker counts")
+    parser.add_argument("--steps", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--out", default=None, help="write results JSON here")
+    parser.add_argument("--baseline", default=None, help="results JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.10, help="allowed slowdown before flagging (0.10 = 10%%)")
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(args.sizes, args.workers, args.steps, args.seed)
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(results, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressed = False
+        for (w, h, n), base_ms, cur_ms, ratio, slow in compare(results, baseline, args.threshold):
+            flag = "REGRESSION" if slow else "ok"
+            print(f"{w}x{h} workers={n}: {base_ms:.3f} -> {cur_ms:.3f} ms/step ({ratio:.2f}x) {flag}")
+            regressed = regressed or slow
+        return 1 if regressed else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,13 +1,38 @@
 import mesa
+from .physiology import PHYSIOLOGY_ATTRS, handle_class
 
 class BaseAnt(mesa.Agent):
     """
     A base class for all ant castes using Mesa 3.0+ features.
     Incorporates basic physiology: energy, health, and metabolism.
     Includes Trophallaxis (Social Feeding).
+
+    When the model runs the array engine (model.physiology), ants are created
+    as handle subclasses whose physiology lives in the model's PhysiologyTable.
+    `caste` is always the plain caste class (WorkerAgent, QueenAgent, ...).
     """
+    cell_slot = "ants"
+    is_handle = False
+    _table = None
+    _row = -1
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if "caste" not in cls.__dict__:
+            cls.caste = cls
+
+    def __new__(cls, model=None, *args, **kwargs):
+        # model is None when unpickling a checkpoint; the class is already right then
+        if model is not None and model.physiology is not None and not cls.is_handle:
+            cls = handle_class(cls)
+        return super().__new__(cls)
+
     def __init__(self, model):
         super().__init__(model)
+        if self.is_handle:
+            self._table = model.physiology
+            self._row = self._table.allocate(self)
+
         self.age = 0
         self.max_age = 5000 
         
@@ -28,6 +53,9 @@ class BaseAnt(mesa.Agent):
 
     def step(self):
         """Standard behavior for each tick."""
+        # Array engine: the model already advanced physiology for every ant this tick
+        if self._row >= 0: return
+
         self.age += 1
         
         # 1. Metabolism: Constant energy drain
@@ -49,6 +77,18 @@ class BaseAnt(mesa.Agent):
         """Handle agent removal."""
         self.remove()
 
+    def remove(self):
+        """Detaches from the physiology table (keeping final values readable) before removal."""
+        if self._row >= 0:
+            for name in PHYSIOLOGY_ATTRS:
+                self.__dict__[name] = getattr(self, name)
+            table, row = self._table, self._row
+            self._row = -1
+            table.release(row)
+        if self.pos is not None:
+            self.model.grid.remove_agent(self)
+        super().remove()
+
     def move_to(self, new_pos):
         """Helper to move the agent on the Mesa grid."""
         self.model.grid.move_agent(self, new_pos)
@@ -1,60 +1,168 @@
+import heapq
+import itertools
 import mesa
-import random
-# from .worker import WorkerAgent # Moved to local import in hatch()
-# from .drone import DroneAgent   # Moved to local import in hatch()
+
+from .worker import WorkerAgent
+from .drone import DroneAgent
 
 class BroodAgent(mesa.Agent):
     """
     Represents a single unit of brood (egg, larva, or pupa).
     Develops through stages and eventually hatches into an adult ant.
+    Development is event-driven by the model's BroodSchedule, so brood is
+    not stepped every tick.
     """
+    scheduled = False # advanced by BroodSchedule, not the model's shuffled step
+
     def __init__(self, model, stage="EGG"):
         super().__init__(model)
+        self._stage = None
         self.stage = stage
-        self.development_timer = 0
-        self.fed_status = 0 # For larvae: how much food they've received
+        self.stage_started = model.steps
+        self.cohort = None      # LarvaCohort while a larva
+        self._fed_status = 0    # fed status once no longer a larva
 
         # Development thresholds (tuned for better simulation feedback)
         self.egg_to_larva_time = 30
         self.larva_to_pupa_food_needed = 3 
         self.pupa_to_adult_time = 60
 
-    def step(self):
-        """Handles the development of the brood through its stages."""
-        self.development_timer += 1
+        model.brood_schedule.add(self)
+
+    @property
+    def stage(self):
+        return self._stage
 
-        if self.stage == "EGG":
-            if self.development_timer >= self.egg_to_larva_time:
-                self.stage = "LARVA"
-                self.development_timer = 0
-                self.fed_status = 0
+    @stage.setter
+    def stage(self, value):
+        """Keeps the model's brood-by-stage counters in sync."""
+        counts = self.model.brood_counts
+        if self._stage is not None:
+            counts[self._stage] -= 1
+        counts[value] += 1
+        self._stage = value
 
-        elif self.stage == "LARVA":
-            if self.fed_status >= self.larva_to_pupa_food_needed:
-                self.stage = "PUPA"
-                self.development_timer = 0
+    @property
+    def development_timer(self):
+        """Ticks spent in the current stage."""
+        return self.model.steps - self.stage_started
 
-        elif self.stage == "PUPA":
-            if self.development_timer >= self.pupa_to_adult_time:
-                self.hatch()
+    @property
+    def fed_status(self):
+        """For larvae: how much food they've received (held in the cohort's array)."""
+        if self.cohort is not None:
+            return self.cohort.fed[self.cohort_slot]
+        return self._fed_status
 
     def feed(self, amount=1):
-        """Increases the fed status of a larva."""
+        """Increases the fed status of a larva; pupates it once fed enough."""
         if self.stage == "LARVA":
-            self.fed_status += amount
+            cohort = self.cohort
+            cohort.fed[self.cohort_slot] += amount
+            if cohort.fed[self.cohort_slot] >= self.larva_to_pupa_food_needed:
+                self.model.brood_schedule.pupate(self)
             return True
         return False
 
     def hatch(self):
         """Transforms the pupa into an adult ant and removes itself."""
-        from .worker import WorkerAgent
-        from .drone import DroneAgent
-
         new_ant = None
-        if self.model.phase == "REPRODUCTIVE" and random.random() < 0.1: 
+        if self.model.phase == "REPRODUCTIVE" and self.model.random.random() < 0.1: 
             new_ant = DroneAgent(self.model)
         else: 
             new_ant = WorkerAgent(self.model)
             
         self.model.grid.place_agent(new_ant, self.pos)
+        self.model.grid.remove_agent(self)
         self.remove()
+
+
+class LarvaCohort:
+    """
+    The larvae sharing one cell, with their fed status in a parallel array.
+    Removal swaps the last member into the freed slot.
+    """
+    def __init__(self):
+        self.members = []
+        self.fed = []
+
+    def __len__(self):
+        return len(self.members)
+
+    def add(self, brood, fed=0):
+        brood.cohort = self
+        brood.cohort_slot = len(self.members)
+        self.members.append(brood)
+        self.fed.append(fed)
+
+    def remove(self, brood):
+        slot = brood.cohort_slot
+        last, last_fed = self.members.pop(), self.fed.pop()
+        if last is not brood:
+            self.members[slot] = last
+            self.fed[slot] = last_fed
+            last.cohort_slot = slot
+        brood._fed_status = self.fed[slot] if last is not brood else last_fed
+        brood.cohort = None
+
+
+class BroodSchedule:
+    """
+    Event-driven brood development.
+    Eggs and pupae wait in a priority queue keyed by the tick they transition,
+    so they cost nothing in between. Larvae are held in per-cell cohorts until
+    nurses have fed them enough to pupate.
+    """
+    def __init__(self, model):
+        self.model = model
+        self.events = []                # heap of (tick, seq, brood)
+        self._seq = itertools.count()   # keeps same-tick events in creation order
+        self.cohorts = {}               # pos -> LarvaCohort
+
+    def _schedule(self, brood, delay):
+        heapq.heappush(self.events, (brood.stage_started + delay, next(self._seq), brood))
+
+    def lay_egg(self, pos):
+        """Creates an egg at pos; it registers itself with this schedule."""
+        egg = BroodAgent(self.model, stage="EGG")
+        self.model.grid.place_agent(egg, pos)
+        return egg
+
+    def add(self, brood):
+        """Registers a new egg or pupa. Larvae join a cohort via add_larva once placed."""
+        if brood.stage == "EGG":
+            self._schedule(brood, brood.egg_to_larva_time)
+        elif brood.stage == "PUPA":
+            self._schedule(brood, brood.pupa_to_adult_time)
+
+    def add_larva(self, brood, fed=0):
+        cohort = self.cohorts.get(brood.pos)
+        if cohort is None:
+            cohort = self.cohorts[brood.pos] = LarvaCohort()
+        cohort.add(brood, fed)
+
+    def larvae_at(self, pos):
+        """The LarvaCohort at pos, or None if no larvae are there."""
+        return self.cohorts.get(pos)
+
+    def pupate(self, brood):
+        cohort = brood.cohort
+        cohort.remove(brood)
+        if not cohort:
+            del self.cohorts[brood.pos]
+        brood.stage = "PUPA"
+        brood.stage_started = self.model.steps
+        self._schedule(brood, brood.pupa_to_adult_time)
+
+    def advance(self):
+        """Fires every transition due at or before the current tick."""
+        now = self.model.steps
+        events = self.events
+        while events and events[0][0] <= now:
+            _, _, brood = heapq.heappop(events)
+            if brood.stage == "EGG":
+                brood.stage = "LARVA"
+                brood.stage_started = now
+                self.add_larva(brood)
+            elif brood.stage == "PUPA":
+                brood.hatch()
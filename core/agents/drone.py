@@ -1,5 +1,5 @@
 from .base_ant import BaseAnt
-import random
+from .queen import QueenAgent
 
 class DroneAgent(BaseAnt):
     """
@@ -24,28 +24,26 @@ class DroneAgent(BaseAnt):
         # 1. Base Physiology: Metabolism, Starvation, Recovery (handled by BaseAnt)
         super().step()
         
-        if self.health <= 0: return
+        if self.pos is None: return # died this tick (starved or of old age)
 
         # 2. Consume colony food
         if self.energy < (self.max_energy * 0.5):
-            if self.model.food_stockpile > 1.0:
-                eaten = self.eat(amount=1.0)
-                self.model.food_stockpile -= eaten
+            if self.model.total_food_stockpile > 1.0:
+                withdrawn = self.model.nest.withdraw(self.pos, 1.0)
+                self.eat(amount=withdrawn)
             
         # 3. Mating Logic (Phase 3: Reproductive)
         if self.model.phase == "REPRODUCTIVE":
-            agents_in_cell = self.model.grid.get_cell_list_contents([self.pos])
-            for agent in agents_in_cell:
+            for ant in self.model.grid.ants_at(self.pos):
                 # Check for Queen
-                from .queen import QueenAgent
-                if isinstance(agent, QueenAgent):
-                    if random.random() < self.mating_success_rate:
+                if ant.caste is QueenAgent:
+                    if self.model.random.random() < self.mating_success_rate:
                         self.remove()
                         return
         
         # 4. Random movement within grid boundaries
-        neighbors = list(self.model.grid.get_neighborhood(self.pos, moore=True, include_center=False))
+        neighbors = self.model.grid.neighbors(self.pos)
         if neighbors:
-            new_pos = random.choice(neighbors)
+            new_pos = self.model.random.choice(neighbors)
             self.move_to(new_pos)
             self.energy -= 0.1 # Movement cost
@@ -0,0 +1,165 @@
+import numpy as np
+
+# Behavioral states stored as small integer codes in the "state" column
+STATE_CODES = {"IDLE": 0, "FORAGING": 1, "RETURNING": 2, "NURSING": 3, "REPRODUCING": 4}
+STATE_NAMES = {code: name for name, code in STATE_CODES.items()}
+
+
+class PhysiologyColumn:
+    """
+    An ant attribute that lives in the model's PhysiologyTable.
+    Only installed on handle classes (see handle_class), so ants in the default
+    engine keep plain instance attributes. A handle detached from the table
+    (row -1) falls back to its instance __dict__.
+    """
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, ant, owner=None):
+        if ant is None: return self
+        if ant._row < 0:
+            return ant.__dict__[self.name]
+        return ant._table.columns[self.name][ant._row]
+
+    def __set__(self, ant, value):
+        if ant._row < 0:
+            ant.__dict__[self.name] = value
+        else:
+            ant._table.columns[self.name][ant._row] = value
+
+
+class StateColumn(PhysiologyColumn):
+    """Behavioral state: a string on the handle, an integer code in the table."""
+    def __get__(self, ant, owner=None):
+        if ant is None: return self
+        if ant._row < 0:
+            return ant.__dict__[self.name]
+        return STATE_NAMES[int(ant._table.columns[self.name][ant._row])]
+
+    def __set__(self, ant, value):
+        if ant._row < 0:
+            ant.__dict__[self.name] = value
+        else:
+            ant._table.columns[self.name][ant._row] = STATE_CODES[value]
+
+
+class PositionColumn:
+    """
+    Grid position: kept on the handle and mirrored into the x/y columns on write.
+    Defines no __get__, so reads come straight from the instance __dict__.
+    """
+    def __set__(self, ant, value):
+        ant.__dict__["pos"] = value
+        if ant._row >= 0 and value is not None:
+            ant._table.columns["x"][ant._row] = value[0]
+            ant._table.columns["y"][ant._row] = value[1]
+
+
+PHYSIOLOGY_ATTRS = ("age", "max_age", "energy", "max_energy", "health", "max_health",
+                    "metabolism_rate", "starvation_rate", "recovery_rate",
+                    "inventory", "inventory_cap", "state")
+
+_HANDLE_CLASSES = {}
+
+def handle_class(cls):
+    """
+    Returns the array-engine variant of an ant class: a subclass whose
+    physiology attributes are backed by PhysiologyTable columns.
+    It keeps the caste's name and reports the caste class as `caste`.
+    """
+    handle = _HANDLE_CLASSES.get(cls)
+    if handle is None:
+        namespace = {name: StateColumn() if name == "state" else PhysiologyColumn()
+                     for name in PHYSIOLOGY_ATTRS}
+        namespace.update({
+            "pos": PositionColumn(),
+            "caste": cls,
+            "is_handle": True,
+            "__module__": cls.__module__,
+            "__qualname__": cls.__qualname__,
+        })
+        handle = type(cls.__name__, (cls,), namespace)
+        _HANDLE_CLASSES[cls] = handle
+    return handle
+
+
+class PhysiologyTable:
+    """
+    Struct-of-arrays store for ant physiology (the optional array engine).
+    Each living ant owns one row; metabolism, starvation, recovery and the
+    death check run as batched array operations once per tick in step().
+    """
+    FLOAT_COLUMNS = ("energy", "max_energy", "health", "max_health", "metabolism_rate",
+                     "starvation_rate", "recovery_rate", "inventory", "inventory_cap")
+    INT_COLUMNS = ("age", "max_age", "state", "x", "y")
+
+    def __init__(self, capacity=256):
+        self.columns = {name: np.zeros(capacity, dtype=np.float64) for name in self.FLOAT_COLUMNS}
+        self.columns.update({name: np.zeros(capacity, dtype=np.int64) for name in self.INT_COLUMNS})
+        self.alive = np.zeros(capacity, dtype=bool)
+        self.owners = [None] * capacity
+        self.free_rows = []
+        self.size = 0 # high-water mark of used rows
+
+    def __len__(self):
+        return self.size - len(self.free_rows)
+
+    def _grow(self):
+        capacity = len(self.alive) * 2
+        for name, column in self.columns.items():
+            grown = np.zeros(capacity, dtype=column.dtype)
+            grown[:len(column)] = column
+            self.columns[name] = grown
+        alive = np.zeros(capacity, dtype=bool)
+        alive[:len(self.alive)] = self.alive
+        self.alive = alive
+        self.owners.extend([None] * (capacity - len(self.owners)))
+
+    def allocate(self, ant):
+        """Reserves a row for a new ant and returns its index."""
+        if self.free_rows:
+            row = self.free_rows.pop()
+        else:
+            if self.size == len(self.alive):
+                self._grow()
+            row = self.size
+            self.size += 1
+        self.alive[row] = True
+        self.owners[row] = ant
+        return row
+
+    def release(self, row):
+        """Frees a row; the caller copies out any values it still needs first."""
+        self.alive[row] = False
+        self.owners[row] = None
+        self.free_rows.append(row)
+
+    def step(self):
+        """
+        Advances every living ant's physiology by one tick.
+        Same rules as BaseAnt.step, applied to all rows at once.
+        Returns the ants that died this tick.
+        """
+        n = self.size
+        c = {name: column[:n] for name, column in self.columns.items()}
+        live = self.alive[:n]
+
+        # 1. Metabolism: Constant energy drain
+        c["age"][live] += 1
+        energy = c["energy"]
+        energy[live] -= c["metabolism_rate"][live]
+
+        # 2. Physiology Logic: Starvation and Recovery
+        starving = live & (energy <= 0)
+        recovering = live & ~starving & (c["health"] < c["max_health"]) & (energy > c["max_energy"] * 0.5)
+
+        energy[starving] = 0
+        c["health"][starving] -= c["starvation_rate"][starving]
+
+        c["health"][recovering] = np.minimum(c["max_health"][recovering],
+                                             c["health"][recovering] + c["recovery_rate"][recovering])
+        energy[recovering] -= c["recovery_rate"][recovering]
+
+        # 3. Death Check
+        dead = live & ((c["health"] <= 0) | (c["age"] >= c["max_age"]))
+        return [self.owners[row] for row in np.flatnonzero(dead)]
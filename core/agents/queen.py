@@ -1,6 +1,4 @@
 from .base_ant import BaseAnt
-from .brood import BroodAgent
-import random
 
 class QueenAgent(BaseAnt):
     """
@@ -23,34 +21,24 @@ class QueenAgent(BaseAnt):
         """Queen behavior: lays eggs based on colony phase and resources."""
         if not self.model: return
         super().step()
-        if self.health <= 0: return
+        if self.pos is None: return # died this tick (starved or of old age)
 
         # 1. Localized Self-Preservation (withdraw from NestCell)
         if self.energy < (self.max_energy * 0.8):
-            cell_contents = self.model.grid.get_cell_list_contents([self.pos])
-            for obj in cell_contents:
-                from core.world.cell import NestCell
-                if isinstance(obj, NestCell):
-                    withdrawn = obj.withdraw_food(1.0)
-                    self.eat(amount=withdrawn)
-                    break
+            if self.pos in self.model.grid.env:
+                withdrawn = self.model.nest.withdraw(self.pos, 1.0)
+                self.eat(amount=withdrawn)
             
         # 2. Dynamic Reproduction
         egg_rate = self.calculate_egg_rate()
-        if self.state == "REPRODUCING" and random.random() < egg_rate:
+        if self.state == "REPRODUCING" and self.model.random.random() < egg_rate:
             if self.energy > self.lay_egg_cost:
                 self.lay_egg()
                 self.energy -= self.lay_egg_cost
 
     def calculate_egg_rate(self):
         # Dynamically scale rate based on local nest food (Queen smells the stockpile)
-        local_food = 0
-        cell_contents = self.model.grid.get_cell_list_contents([self.pos])
-        for obj in cell_contents:
-            from core.world.cell import NestCell
-            if isinstance(obj, NestCell):
-                local_food = obj.stored_food
-                break
+        local_food = self.model.nest.stored_at(self.pos)
 
         rate = self.base_egg_laying_rate
         if self.model.phase == "ERGONOMIC": rate *= 2.0
@@ -63,5 +51,4 @@ class QueenAgent(BaseAnt):
 
     def lay_egg(self):
         """Creates a new BroodAgent (egg)."""
-        new_brood = BroodAgent(self.model, stage="EGG")
-        self.model.grid.place_agent(new_brood, self.pos)
+        self.model.brood_schedule.lay_egg(self.pos)
@@ -1,8 +1,4 @@
 from .base_ant import BaseAnt
-from ..world.cell import FoodSource, PheromoneCell, NestCell
-from .brood import BroodAgent
-import random
-import math
 
 class WorkerAgent(BaseAnt):
     """
@@ -21,12 +17,14 @@ class WorkerAgent(BaseAnt):
         self.move_cost = 0.05
         self.forage_cost = 0.5
         self.nurse_cost = 0.8
+        
+        self.leave_idle = False # set while dozing through a drawn idle spell
 
     def step(self):
         """Worker behavior with State Completion logic."""
         if not self.model: return
         super().step() # Metabolism and Age
-        if self.health <= 0: return
+        if self.pos is None: return # died this tick (starved or of old age)
 
         # 1. Immediate Self-Feeding (if food is already in hand or under feet)
         self.check_self_feeding()
@@ -37,56 +35,70 @@ class WorkerAgent(BaseAnt):
             self.update_task()
 
         # 3. Execute the current state
-        if self.state == "FORAGING":
+        state = self.state
+        if state == "FORAGING":
             self.execute_foraging()
         
-        elif self.state == "RETURNING":
+        elif state == "RETURNING":
             self.execute_returning()
 
-        elif self.state == "NURSING":
+        elif state == "NURSING":
             self.execute_nursing()
         
-        elif self.state == "IDLE":
+        elif state == "IDLE":
             # Idle ants stay in the nest until they decide to work
-            if random.random() < 0.1: # Small chance to wake up and check tasks
+            if self.model.random.random() < 0.1: # Small chance to wake up and check tasks
                 self.update_task()
+            if self.state == "IDLE":
+                self.doze()
 
     def is_at_nest(self):
         """Checks if the ant is currently standing on a NestCell."""
-        cell_contents = self.model.grid.get_cell_list_contents([self.pos])
-        return any(isinstance(obj, NestCell) for obj in cell_contents)
+        return self.pos in self.model.grid.env
 
     def update_task(self):
         """
         Decision Hub: Only called when in the nest and inventory is empty.
         Determines the next behavioral chain to commit to.
         """
+        leave_idle, self.leave_idle = self.leave_idle, False
+
         # Critical Hunger Override: Go forage for self
         if self.energy < (self.max_energy * 0.3):
             self.state = "FORAGING"
             return
 
-        food_level = self.model.total_food_stockpile
-        brood_count = self.model.brood_count
-        
-        # Calculate Propensities based on colony needs
-        f_weight = 0.4
-        n_weight = 0.3
-        i_weight = 0.3
-
-        if self.model.phase == "FOUNDING":
-            if food_level < 50: f_weight += 0.8
-            if brood_count > 0: n_weight += 0.4
-        elif self.model.phase == "ERGONOMIC":
-            if food_level < 150: f_weight += 0.5
-            if brood_count > 10: n_weight += 0.7
-        else: # Reproductive
-            if food_level < 500: f_weight += 1.0
-            if brood_count > 20: n_weight += 0.3
-
-        # Weighted Choice
-        self.state = random.choices(["FORAGING", "NURSING", "IDLE"], 
-                                     weights=[f_weight, n_weight, i_weight], k=1)[0]
+        # Weighted choice from the colony's pre-drawn pool (see core.tasks.TaskAllocator).
+        # Woken at the end of a drawn idle spell: this is the tick it stops idling.
+        self.state = self.model.tasks.draw(leave_idle)
+
+    def doze(self):
+        """
+        An idle worker in the nest re-rolls its task every tick. With the array
+        physiology engine (metabolism runs without stepping the ant) draw how many
+        more ticks it stays idle and sleep through them instead.
+        The stay probability uses the colony needs at the time it dozes off.
+        It wakes early once hungry enough to self-feed.
+        """
+        if self._row < 0 or self.inventory > 0 or not self.is_at_nest(): return
+
+        f_weight, n_weight, i_weight = self.model.tasks.weights
+        p_idle = i_weight / (f_weight + n_weight + i_weight)
+        p_stay = p_idle * (0.9 + 0.1 * p_idle) # idle draw, then no 10% re-roll or re-rolled idle again
+        stays = int(self.model.rng.geometric(1.0 - p_stay)) - 1
+        if stays <= 0: return
+
+        drain = self.metabolism_rate + (self.recovery_rate if self.health < self.max_health else 0.0)
+        surplus = self.energy - self.max_energy * 0.7
+        if surplus < 0: return
+        hungry_in = int(surplus // drain) + 1
+
+        now = self.model.steps
+        if hungry_in <= stays:
+            self.model.scheduler.sleep(self, now + hungry_in)
+        else:
+            self.leave_idle = True
+            self.model.scheduler.sleep(self, now + stays + 1)
 
     def execute_foraging(self):
         """Commit to finding food. Cannot stop until inventory > 0."""
@@ -96,11 +108,10 @@ class WorkerAgent(BaseAnt):
             self.energy -= self.move_cost
         
         # Check for food to harvest
-        cell_contents = self.model.grid.get_cell_list_contents([self.pos])
-        food_source = next((obj for obj in cell_contents if isinstance(obj, FoodSource) and obj.amount > 0), None)
+        food = self.model.food
         
-        if food_source:
-            self.inventory = food_source.harvest(self.inventory_cap)
+        if food.has(self.pos):
+            self.inventory = food.harvest(self.pos, self.inventory_cap)
             self.energy -= self.forage_cost
             self.state = "RETURNING" # Automatically switch to returning chain
 
@@ -108,61 +119,43 @@ class WorkerAgent(BaseAnt):
         """Commit to returning food to nest. Cannot stop until inventory == 0."""
         self.lay_pheromone()
         
-        # Check if on nest cell to deposit
-        cell_contents = self.model.grid.get_cell_list_contents([self.pos])
-        nest_cell = next((obj for obj in cell_contents if isinstance(obj, NestCell)), None)
-        
-        if nest_cell and self.inventory > 0:
-            actual_stored = nest_cell.store_food(self.inventory)
+        # Deposit anywhere in the nest; the ledger fills the nearest free slots
+        if self.is_at_nest() and self.inventory > 0:
+            actual_stored = self.model.nest.deposit(self.pos, self.inventory)
             self.inventory -= actual_stored
-            # If still have food (nest cell full), keep looking for another nest cell
+            # If still have food (whole nest full), keep carrying it
             if self.inventory <= 0:
                 # Chain complete! Will re-evaluate next step because is_at_nest() will be true.
                 return
 
         # Move towards nest center
-        cx, cy = self.model.width // 2, self.model.height // 2
-        nest_pos = (cx, cy)
-        neighbors = list(self.model.grid.get_neighborhood(self.pos, moore=True, include_center=False))
-        if neighbors:
-            best_neighbor = min(neighbors, key=lambda n: math.dist(n, nest_pos))
-            self.move_to(best_neighbor)
-            self.energy -= self.move_cost
+        self.move_to(self.model.homing_field[self.pos])
+        self.energy -= self.move_cost
 
     def execute_nursing(self):
         """Commit to brood care. If no larvae or food, task ends."""
         # 1. Ensure we are in the nest
         if not self.is_at_nest():
-            cx, cy = self.model.width // 2, self.model.height // 2
-            nest_pos = (cx, cy)
-            neighbors = list(self.model.grid.get_neighborhood(self.pos, moore=True, include_center=False))
-            if neighbors:
-                best_neighbor = min(neighbors, key=lambda n: math.dist(n, nest_pos))
-                self.move_to(best_neighbor)
+            self.move_to(self.model.homing_field[self.pos])
             return
 
-        # 2. Check for food to give. If empty, try to withdraw from current cell.
+        # 2. Check for food to give. If empty, try to withdraw from the nearest stocked slot.
         if self.inventory <= 0:
-            cell_contents = self.model.grid.get_cell_list_contents([self.pos])
-            nest_cell = next((obj for obj in cell_contents if isinstance(obj, NestCell)), None)
-            if nest_cell:
-                self.inventory = nest_cell.withdraw_food(1.0) # Withdraw a small amount to feed
+            self.inventory = self.model.nest.withdraw(self.pos, 1.0) # Withdraw a small amount to feed
         
         # 3. Feed larvae in the immediate vicinity
         if self.inventory > 0:
-            cell_contents = self.model.grid.get_cell_list_contents([self.pos])
-            larvae = [a for a in cell_contents if isinstance(a, BroodAgent) and a.stage == "LARVA"]
+            larvae = self.model.brood_schedule.larvae_at(self.pos)
             if larvae:
-                target = random.choice(larvae)
+                target = self.model.random.choice(larvae.members)
                 if target.feed(0.5):
                     self.inventory -= 0.5
                     self.energy -= self.nurse_cost
             else:
                 # No larvae here? Move randomly within the nest to find some
-                neighbors = list(self.model.grid.get_neighborhood(self.pos, moore=True, include_center=False))
-                nest_neighbors = [n for n in neighbors if any(isinstance(obj, NestCell) for obj in self.model.grid.get_cell_list_contents([n]))]
+                nest_neighbors = self.model.nest_neighbors[self.pos]
                 if nest_neighbors:
-                    self.move_to(random.choice(nest_neighbors))
+                    self.move_to(self.model.random.choice(nest_neighbors))
         else:
             # Out of food to nurse with, task ends
             self.state = "IDLE"
@@ -174,45 +167,36 @@ class WorkerAgent(BaseAnt):
                 eaten = self.eat(amount=min(1.0, self.inventory))
                 self.inventory -= eaten
             
-            if self.energy < (self.max_energy * 0.7) and self.is_at_nest():
-                cell_contents = self.model.grid.get_cell_list_contents([self.pos])
-                nest_cell = next((obj for obj in cell_contents if isinstance(obj, NestCell)), None)
-                if nest_cell:
-                    withdrawn = nest_cell.withdraw_food(1.0)
+            if self.energy < (self.max_energy * 0.7):
+                if self.is_at_nest():
+                    withdrawn = self.model.nest.withdraw(self.pos, 1.0)
                     self.eat(amount=withdrawn)
 
     def lay_pheromone(self):
-        cell_contents = self.model.grid.get_cell_list_contents([self.pos])
-        for obj in cell_contents:
-            if hasattr(obj, 'add_pheromone'):
-                obj.add_pheromone(self.max_pheromone)
+        self.model.pheromones.add(self.pos, self.max_pheromone)
 
     def sense_and_move(self):
-        neighbors = list(self.model.grid.get_neighborhood(self.pos, moore=True, include_center=False))
+        grid = self.model.grid
+        neighbors = grid.neighbors(self.pos)
         if not neighbors: return self.pos
-        random.shuffle(neighbors)
         
-        nearby_cells = self.model.grid.get_neighborhood(self.pos, moore=True, include_center=False, radius=self.scent_radius)
-        food_locations = []
-        for cell_pos in nearby_cells:
-            for obj in self.model.grid.get_cell_list_contents([cell_pos]):
-                if isinstance(obj, FoodSource) and obj.amount > 0:
-                    food_locations.append(cell_pos)
-        
-        if food_locations:
-            closest_food = min(food_locations, key=lambda f: math.dist(self.pos, f))
-            best_n = min(neighbors, key=lambda n: math.dist(n, closest_food))
+        closest_food = self.model.food.index.nearest(self.pos, self.scent_radius)
+        if closest_food:
+            # Shuffled so that ties towards the food break randomly
+            neighbors = list(neighbors)
+            self.model.random.shuffle(neighbors)
+            best_n = min(neighbors, key=lambda n: grid.distance(n, closest_food))
             return best_n
 
-        if random.random() < self.exploration_rate:
-            return random.choice(neighbors)
+        # Batched kernel (core.movement); the rest of this method is the per-ant reference
+        if self.model.movement is not None:
+            planned = self.model.movement.next_pos(self)
+            if planned: return planned
+
+        if self.model.random.random() < self.exploration_rate:
+            return self.model.random.choice(neighbors)
         
-        neighbor_pheromones = []
-        for n in neighbors:
-            p_level = 0.0
-            for obj in self.model.grid.get_cell_list_contents([n]):
-                if isinstance(obj, PheromoneCell):
-                    p_level += obj.pheromone_level
-            neighbor_pheromones.append(p_level + 0.1)
+        pheromones = self.model.pheromones
+        neighbor_pheromones = [pheromones.level(n) + 0.1 for n in neighbors]
         
-        return random.choices(neighbors, weights=neighbor_pheromones, k=1)[0]
+        return self.model.random.choices(neighbors, weights=neighbor_pheromones, k=1)[0]
@@ -0,0 +1,122 @@
+"""
+Headless batch runner for AntColonyModel.
+Runs replicates and parameter grids over a process pool without importing
+any rendering dependency, and gathers DataCollector output into one table.
+"""
+import inspect
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from core.model import AntColonyModel
+from core.recorder import StreamingCollector
+from core.profiling import Profiler, merge_reports
+
+# Names AntColonyModel accepts; its **kwargs would otherwise swallow a misspelt one silently
+MODEL_PARAMETERS = frozenset(name for name, param in inspect.signature(AntColonyModel.__init__).parameters.items()
+                             if name != "self" and param.kind is not param.VAR_KEYWORD)
+
+
+def parameter_grid(parameters):
+    """
+    Expands {"name": value_or_list} into a list of model kwargs.
+    Lists and tuples are swept; anything else is held fixed.
+    Raises ValueError for names AntColonyModel does not take.
+    """
+    unknown = sorted(set(parameters) - MODEL_PARAMETERS)
+    if unknown:
+        raise ValueError(f"unknown model parameter(s): {', '.join(unknown)}")
+    names = list(parameters)
+    values = [v if isinstance(v, (list, tuple)) else [v] for v in parameters.values()]
+    return [dict(zip(names, combo)) for combo in itertools.product(*values)]
+
+
+def run_model(params, steps, run_id=0, replicate=0, stream=None, checkpoint=None, profile=False):
+    """
+    Runs one model for `steps` ticks and returns its model-level data as a DataFrame.
+    With `stream` = {"directory": ..., "interval": ..., "agent_interval": ...}, the data
+    goes to run_<id> files in that directory instead and the frame holds one row
+    pointing at them.
+    With `checkpoint` = {"directory": ..., "every": ...}, the run is saved to
+    run_<id>.ckpt every `every` steps and resumes from that file if it exists.
+    With `profile`, the frame carries a core.profiling report in df.attrs["profile"].
+    """
+    ckpt_path = None
+    if checkpoint is not None:
+        ckpt_path = os.path.join(checkpoint["directory"], f"run_{run_id}.ckpt")
+    if ckpt_path and os.path.exists(ckpt_path):
+        model = AntColonyModel.load_checkpoint(ckpt_path)
+    else:
+        model = AntColonyModel(**params)
+
+    profiler = Profiler(model) if profile else None
+
+    def advance():
+        if profiler: profiler.enable()
+        try:
+            while model.steps < steps:
+                model.step()
+                if ckpt_path and (model.steps % checkpoint["every"] == 0 or model.steps == steps):
+                    model.save_checkpoint(ckpt_path)
+        finally:
+            if profiler: profiler.disable()
+
+    if stream is None:
+        advance()
+        df = model.datacollector.get_model_vars_dataframe()
+        df.insert(0, "Step", range(1, len(df) + 1))
+    else:
+        # A resumed run streams into a new file so earlier samples are never overwritten
+        name = f"run_{run_id}" if model.steps == 0 else f"run_{run_id}_from_{model.steps}"
+        with StreamingCollector(os.path.join(stream["directory"], name),
+                                interval=stream.get("interval", 1),
+                                agent_interval=stream.get("agent_interval")) as collector:
+            model.datacollector = collector
+            advance()
+        df = pd.DataFrame({"Steps": [model.steps], "Path": [collector.path]})
+    if profiler:
+        df.attrs["profile"] = profiler.report()
+    df.insert(0, "Replicate", replicate)
+    df.insert(0, "RunId", run_id)
+    for name, value in params.items():
+        df[name] = value
+    return df
+
+
+def _run_job(job):
+    return run_model(*job)
+
+
+def run_sweep(parameters, steps, replicates=1, processes=None, seed=None, stream=None, checkpoint=None,
+              profile=False):
+    """
+    Runs every combination in `parameters` `replicates` times on a process pool.
+    processes=None uses every core; processes=1 runs in-process.
+    With a base `seed`, run i is seeded with seed + i so the whole sweep replays exactly.
+    `stream` and `checkpoint` are passed to run_model to write each run to disk as it goes
+    and to resume interrupted runs.
+    Returns all runs concatenated into one DataFrame; with `profile`, the summed
+    profiling report of every run is in its attrs["profile"].
+    """
+    jobs = []
+    for params in parameter_grid(parameters):
+        for replicate in range(replicates):
+            run_params = dict(params)
+            if seed is not None:
+                run_params["seed"] = seed + len(jobs)
+            jobs.append((run_params, steps, len(jobs), replicate, stream, checkpoint, profile))
+
+    if processes == 1:
+        frames = [_run_job(job) for job in jobs]
+    else:
+        workers = min(processes or os.cpu_count() or 1, len(jobs))
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            frames = list(pool.map(_run_job, jobs))
+
+    profiles = [frame.attrs.pop("profile") for frame in frames if "profile" in frame.attrs]
+    results = pd.concat(frames, ignore_index=True)
+    if profiles:
+        results.attrs["profile"] = merge_reports(profiles)
+    return results
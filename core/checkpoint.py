@@ -0,0 +1,46 @@
+"""
+Checkpoint and resume for AntColonyModel.
+A checkpoint is the pickled model, gzip-compressed: grid, pheromone field,
+nest stores, food, ants and brood with their timers and event queues, phase,
+step count, both RNG states and the collected model series. Loading one
+continues the run exactly where it was saved.
+"""
+import gzip
+import io
+import os
+import pickle
+
+from core.agents.physiology import handle_class
+
+FORMAT_VERSION = 3
+
+
+class CheckpointPickler(pickle.Pickler):
+    """
+    Array-engine ants are instances of generated handle classes that are not
+    importable by name; they are pickled as handle_class(caste) instead.
+    """
+    def reducer_override(self, obj):
+        if isinstance(obj, type) and obj.__dict__.get("is_handle"):
+            return handle_class, (obj.caste,)
+        return NotImplemented
+
+
+def save(model, path):
+    """Writes `model` to `path`, replacing any previous checkpoint atomically."""
+    buffer = io.BytesIO()
+    CheckpointPickler(buffer, protocol=pickle.HIGHEST_PROTOCOL).dump((FORMAT_VERSION, model))
+
+    tmp_path = path + ".tmp"
+    with gzip.open(tmp_path, "wb", compresslevel=3) as f:
+        f.write(buffer.getvalue())
+    os.replace(tmp_path, path)
+
+
+def load(path):
+    """Reads a model written by save()."""
+    with gzip.open(path, "rb") as f:
+        version, model = pickle.load(f)
+    if version != FORMAT_VERSION:
+        raise ValueError(f"Unsupported checkpoint version {version} in {path}")
+    return model
@@ -1,8 +1,34 @@
+import itertools
 import mesa
-import random
+import numpy as np
+from collections import Counter
 from core.agents.base_ant import BaseAnt
 from core.agents.worker import WorkerAgent
-from core.agents.brood import BroodAgent
+from core.agents.queen import QueenAgent
+from core.agents.brood import BroodAgent, BroodSchedule
+from core.agents.physiology import PhysiologyTable
+from core.world.cell import NestCell
+from core.world.food import FoodLayer
+from core.world.nest import NestLedger
+from core.world.pheromone import PheromoneField, LazyPheromoneField
+from core.world.hex_grid import HexGrid
+from core.scheduler import ActiveScheduler
+from core.tasks import TaskAllocator
+from core.movement import ForagerMoves
+from core import checkpoint
+
+# Model-level series, shared by the in-memory DataCollector and core.recorder.StreamingCollector
+MODEL_REPORTERS = {
+    "Ants": "ant_count",
+    "Workers": lambda m: m.ant_counts[WorkerAgent],
+    "Food": "total_food_stockpile",
+    "Brood": "brood_count",
+    "Eggs": lambda m: m.brood_counts["EGG"],
+    "Larvae": lambda m: m.brood_counts["LARVA"],
+    "Pupae": lambda m: m.brood_counts["PUPA"],
+    "Phase": "phase"
+}
+
 
 class AntColonyModel(mesa.Model):
     """
@@ -10,23 +36,52 @@ class AntColonyModel(mesa.Model):
     Fully aligned with Mesa 3.3.1 API.
     Includes Dynamic Food Spawning.
     """
-    def __init__(self, width=50, height=50, initial_workers=15, **kwargs):
-        super().__init__()
+    def __init__(self, width=50, height=50, initial_workers=15,
+                 ergonomic_worker_threshold=None, ergonomic_food_threshold=200,
+                 reproductive_worker_threshold=50, reproductive_food_threshold=500,
+                 pheromone_decay_rate=0.03, lazy_pheromones=False, physiology_engine=False,
+                 batched_movement=False, seed=None, **kwargs):
+        # Every stochastic decision goes through self.random (stdlib) or
+        # self.rng (NumPy, for batched draws), both seeded from `seed`.
+        super().__init__(seed=seed)
+        
+        # 0. Counter Registry (kept current on registration, removal, stage change and storage)
+        self.ant_counts = Counter()    # by caste class
+        self.brood_counts = Counter()  # by stage
+        
+        # Optional struct-of-arrays engine: ant physiology in NumPy columns, stepped in batch
+        self.physiology = PhysiologyTable() if physiology_engine else None
+        
+        # Brood develops on an event queue instead of being stepped every tick
+        self.brood_schedule = BroodSchedule(self)
+        # Only agents with something to do are stepped
+        self.scheduler = ActiveScheduler(self)
+        # Worker task propensities, computed once per tick
+        self.tasks = TaskAllocator(self)
+        # Optional batched random walk for foragers (per-ant path otherwise)
+        self.movement = ForagerMoves(self) if batched_movement else None
+        
         self.width = width
         self.height = height
         
-        # 1. Grid
-        self.grid = mesa.space.MultiGrid(width, height, torus=False)
+        # 1. Grid & Pheromone Layer
+        self.grid = HexGrid(width, height)
+        # Lazy mode decays a cell only when it is read
+        field_cls = LazyPheromoneField if lazy_pheromones else PheromoneField
+        self.pheromones = field_cls(width, height, decay_rate=pheromone_decay_rate)
+        self.food = FoodLayer(width, height, self.grid.distance, self.grid.neighbor_index)
         
         # 2. Colony Stats
         self.phase = "FOUNDING" 
         self.initial_workers = initial_workers 
         
         # Phase transition thresholds
-        self.ergonomic_worker_threshold = initial_workers * 2
-        self.ergonomic_food_threshold = 200
-        self.reproductive_worker_threshold = 50
-        self.reproductive_food_threshold = 500
+        if ergonomic_worker_threshold is None:
+            ergonomic_worker_threshold = initial_workers * 2
+        self.ergonomic_worker_threshold = ergonomic_worker_threshold
+        self.ergonomic_food_threshold = ergonomic_food_threshold
+        self.reproductive_worker_threshold = reproductive_worker_threshold
+        self.reproductive_food_threshold = reproductive_food_threshold
         
         # 3. Create Environmental Layer
         self.create_environment()
@@ -38,81 +93,144 @@ class AntColonyModel(mesa.Model):
         self.distribute_initial_food(100)
         
         # 6. Data Collection
-        self.datacollector = mesa.DataCollector(
-            model_reporters={
-                "Ants": lambda m: len([a for a in m.agents if isinstance(a, BaseAnt)]),
-                "Workers": lambda m: len([a for a in m.agents if isinstance(a, WorkerAgent)]),
-                "Food": "total_food_stockpile",
-                "Brood": lambda m: len([a for a in m.agents if isinstance(a, BroodAgent)]),
-                "Eggs": lambda m: len([a for a in m.agents if isinstance(a, BroodAgent) and a.stage == "EGG"]),
-                "Larvae": lambda m: len([a for a in m.agents if isinstance(a, BroodAgent) and a.stage == "LARVA"]),
-                "Pupae": lambda m: len([a for a in m.agents if isinstance(a, BroodAgent) and a.stage == "PUPA"]),
-                "Phase": "phase"
-            }
-        )
+        self.datacollector = mesa.DataCollector(model_reporters=MODEL_REPORTERS)
+
+    def __getstate__(self):
+        # Reporters are lambdas, so only the collected series travel with the model
+        state = self.__dict__.copy()
+        # Mesa binds step per instance; drop any wrapper over it (e.g. core.profiling) and rebind on load
+        state.pop("step", None)
+        collector = state.pop("datacollector")
+        # Mesa counts agent ids per model object; carry the counter over so new agents never reuse an id
+        next_id = next(mesa.Agent._ids[self])
+        mesa.Agent._ids[self] = itertools.count(next_id)
+        state["next_agent_id"] = next_id
+        state["model_vars"] = collector.model_vars if isinstance(collector, mesa.DataCollector) else None
+        return state
+
+    def __setstate__(self, state):
+        model_vars = state.pop("model_vars")
+        mesa.Agent._ids[self] = itertools.count(state.pop("next_agent_id"))
+        self.__dict__.update(state)
+        self.step = self._wrapped_step
+        self.datacollector = mesa.DataCollector(model_reporters=MODEL_REPORTERS)
+        if model_vars is not None:
+            self.datacollector.model_vars = model_vars
+
+    def save_checkpoint(self, path):
+        """Writes the full simulation state to `path` (see core.checkpoint)."""
+        checkpoint.save(self, path)
+
+    @classmethod
+    def load_checkpoint(cls, path):
+        """Restores a model saved with save_checkpoint, ready to keep stepping."""
+        return checkpoint.load(path)
 
     def distribute_initial_food(self, amount):
-        from core.world.cell import NestCell
-        nest_cells = [a for a in self.agents if isinstance(a, NestCell)]
-        if not nest_cells: return
+        positions = self.nest.positions
+        if not positions: return
         
-        food_per_cell = amount / len(nest_cells)
-        for cell in nest_cells:
-            cell.store_food(food_per_cell)
+        food_per_cell = amount / len(positions)
+        for pos in positions:
+            self.nest.deposit(pos, food_per_cell)
+
+    def register_agent(self, agent):
+        super().register_agent(agent)
+        if getattr(agent, "scheduled", True):
+            self.scheduler.add(agent)
+        if isinstance(agent, BaseAnt):
+            self.ant_counts[agent.caste] += 1
+        # Brood stages are counted by BroodAgent.stage itself once it is set.
+
+    def deregister_agent(self, agent):
+        super().deregister_agent(agent)
+        self.scheduler.discard(agent)
+        if isinstance(agent, BaseAnt):
+            self.ant_counts[agent.caste] -= 1
+        elif isinstance(agent, BroodAgent):
+            self.brood_counts[agent.stage] -= 1
 
     @property
     def total_food_stockpile(self):
-        from core.world.cell import NestCell
-        total = 0.0
-        for agent in self.agents:
-            if isinstance(agent, NestCell):
-                total += agent.stored_food
-        return total
+        return self.nest.total
+
+    @property
+    def ant_count(self):
+        return sum(self.ant_counts.values())
 
     @property
     def brood_count(self):
-        return len([a for a in self.agents if isinstance(a, BroodAgent)])
+        return sum(self.brood_counts.values())
 
     def create_environment(self):
-        from core.world.cell import PheromoneCell, NestCell, FoodSource
         cx, cy = self.width // 2, self.height // 2
         
-        for x in range(self.width):
-            for y in range(self.height):
-                if abs(x - cx) <= 2 and abs(y - cy) <= 2:
-                    cell = NestCell(self)
-                else:
-                    cell = PheromoneCell(self)
+        # Open terrain only needs the pheromone field; only the nest gets agents.
+        self.nest_center = (cx, cy)
+        self.nest_mask = np.zeros((self.width, self.height), dtype=bool)
+        for x in range(max(0, cx - 2), min(self.width, cx + 3)):
+            for y in range(max(0, cy - 2), min(self.height, cy + 3)):
+                cell = NestCell(self)
                 self.grid.place_agent(cell, (x, y))
+                self.nest_mask[x, y] = True
+        # Nest food storage, one slot per nest cell
+        self.nest = NestLedger(list(self.grid.env), self.grid.distance, center=self.nest_center)
+        self.build_homing_tables()
         
         # Initial Food Patches
         for _ in range(8):
             self.spawn_random_food()
 
+    def build_homing_tables(self):
+        """
+        The nest never moves, so precompute once per cell:
+        - homing_field: the neighbouring hex closest to the nest center
+        - nest_neighbors: for nest cells, the neighbouring cells that are also nest
+        """
+        self.homing_field = {}
+        self.nest_neighbors = {}
+        for x in range(self.width):
+            for y in range(self.height):
+                neighbors = self.grid.neighbors((x, y))
+                self.homing_field[(x, y)] = min(neighbors, key=lambda n: self.grid.distance(n, self.nest_center))
+                if (x, y) in self.grid.env:
+                    self.nest_neighbors[(x, y)] = [n for n in neighbors if n in self.grid.env]
+
     def spawn_random_food(self):
         """Creates a new seed food source randomly on the map."""
-        from core.world.cell import FoodSource, NestCell
         cx, cy = self.width // 2, self.height // 2
         
-        fx = random.randint(0, self.width - 1)
-        fy = random.randint(0, self.height - 1)
+        fx = self.random.randint(0, self.width - 1)
+        fy = self.random.randint(0, self.height - 1)
         
         # Ensure it's not too close to the nest
         if abs(fx - cx) < 10 and abs(fy - cy) < 10:
             return
 
         # Don't overlap with existing nest/food
-        cell_contents = self.grid.get_cell_list_contents([(fx, fy)])
-        if any(isinstance(obj, (NestCell, FoodSource)) for obj in cell_contents):
+        if not self.is_free_for_food((fx, fy)):
             return
 
-        food = FoodSource(self, amount=random.randint(50, 150))
-        self.grid.place_agent(food, (fx, fy))
+        self.food.add((fx, fy), self.random.randint(50, 150))
+
+    def pop_dirty_cells(self, include_pheromones=True):
+        """
+        Returns every cell whose food, nest storage or pheromone level changed
+        since the previous call, and starts a new tracking window.
+        Pass include_pheromones=False when pheromones are drawn from the field directly.
+        """
+        dirty = self.nest.pop_changed()
+        dirty.update(self.food.pop_changed())
+        if include_pheromones:
+            dirty.update(self.pheromones.pop_changed())
+        else:
+            self.pheromones.clear_changed()
+        return dirty
+
+    def is_free_for_food(self, pos):
+        return not self.nest_mask[pos] and not self.food.has(pos)
 
     def spawn_initial_colony(self, initial_workers):
-        from core.agents.worker import WorkerAgent
-        from core.agents.queen import QueenAgent
-        
         cx, cy = self.width // 2, self.height // 2
         queen = QueenAgent(self)
         self.grid.place_agent(queen, (cx, cy))
@@ -121,9 +239,12 @@ class AntColonyModel(mesa.Model):
             worker = WorkerAgent(self)
             self.grid.place_agent(worker, (cx, cy))
 
+    def colony_totals(self):
+        """Worker count and food stockpile that drive phase transitions and task weights."""
+        return self.ant_counts[WorkerAgent], self.total_food_stockpile
+
     def update_colony_phase(self):
-        current_workers = len([a for a in self.agents if isinstance(a, WorkerAgent)])
-        food_stockpile = self.total_food_stockpile
+        current_workers, food_stockpile = self.colony_totals()
 
         if self.phase == "FOUNDING":
             if current_workers >= self.ergonomic_worker_threshold and food_stockpile >= self.ergonomic_food_threshold:
@@ -138,8 +259,17 @@ class AntColonyModel(mesa.Model):
         self.update_colony_phase()
         
         # Dynamic Food Spawning: Very low chance each tick to drop a new seed
-        if random.random() < 0.005:
+        if self.random.random() < 0.005:
             self.spawn_random_food()
 
-        self.agents.shuffle_do("step")
+        self.pheromones.decay()
+        self.food.step(self.rng, self.nest_mask)
+        if self.physiology is not None:
+            for ant in self.physiology.step():
+                ant.die()
+        self.brood_schedule.advance()
+        self.tasks.refresh()
+        if self.movement is not None:
+            self.movement.refresh()
+        self.scheduler.step()
         self.datacollector.collect(self)
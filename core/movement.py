@@ -0,0 +1,64 @@
+import numpy as np
+
+from core.agents.worker import WorkerAgent
+
+
+class ForagerMoves:
+    """
+    Batched pheromone-weighted random walk for foragers with no food in scent range.
+    Before agents step each tick, it gathers every foraging worker's position,
+    looks up the pheromone level of all their neighbours in one array operation
+    through HexGrid.neighbor_index, mixes in the uniform exploration step and
+    samples every next position with one draw. WorkerAgent.sense_and_move then
+    takes the planned move instead of running the per-ant reference path; ants
+    that start foraging during the tick take the reference path.
+
+    Each ant picks a neighbour with probability
+        exploration_rate / k + (1 - exploration_rate) * (level + 0.1) / sum(level + 0.1)
+    which is the distribution of the per-ant path, but read from the levels at
+    the start of the tick rather than after earlier ants have laid pheromone.
+    """
+    def __init__(self, model):
+        self.model = model
+        self.moves = {}   # ant -> (pos when planned, next pos)
+
+    def refresh(self):
+        """Plans this tick's moves; called by the model before agents step."""
+        self.plan()
+
+    def next_pos(self, ant):
+        """The planned move for `ant`, or None if it was not planned from where it stands."""
+        planned = self.moves.get(ant)
+        if planned is None or planned[0] != ant.pos: return None
+        return planned[1]
+
+    def plan(self):
+        model = self.model
+        ants = [ant for agent_type, agents in model.agents_by_type.items()
+                if issubclass(agent_type, WorkerAgent)
+                for ant in agents if ant.state == "FORAGING" and ant.pos is not None]
+        self.moves = {}
+        if not ants: return
+
+        height = model.grid.height
+        pos = np.array([ant.pos for ant in ants])
+        explore = np.array([ant.exploration_rate for ant in ants])
+
+        # 1. Neighbour levels for every forager at once (padding masked out)
+        neighbors = model.grid.neighbor_index[pos[:, 0] * height + pos[:, 1]]
+        valid = neighbors >= 0
+        weights = np.where(valid, model.pheromones.levels_at(neighbors) + 0.1, 0.0)
+
+        # 2. Exploration mix: uniform over the valid neighbours
+        counts = valid.sum(axis=1, keepdims=True)
+        probs = ((1.0 - explore)[:, None] * weights / weights.sum(axis=1, keepdims=True)
+                 + explore[:, None] * valid / counts)
+
+        # 3. One draw for all: first neighbour whose cumulative probability exceeds u
+        cum = probs.cumsum(axis=1)
+        u = model.rng.random(len(ants)) * cum[:, -1]
+        choice = np.minimum((cum <= u[:, None]).sum(axis=1), counts[:, 0] - 1)
+        targets = neighbors[np.arange(len(ants)), choice]
+
+        for ant, start, target in zip(ants, pos.tolist(), targets.tolist()):
+            self.moves[ant] = (tuple(start), divmod(target, height))
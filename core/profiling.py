@@ -0,0 +1,145 @@
+"""
+Opt-in hot-path instrumentation for AntColonyModel.
+A Profiler wraps a fixed list of methods (agent steps, worker behaviours,
+world updates, data collection, grid queries) with call counters and timers
+while it is enabled, and puts the original methods back when it is disabled,
+so an unprofiled run pays nothing.
+
+    with Profiler(model) as profiler:
+        for _ in range(1000):
+            model.step()
+    print(profiler.summary())
+"""
+import time
+from collections import defaultdict
+
+import mesa
+
+from core.recorder import StreamingCollector
+from core.agents.worker import WorkerAgent
+from core.agents.queen import QueenAgent
+from core.agents.drone import DroneAgent
+from core.agents.brood import BroodSchedule
+from core.world.food import FoodLayer
+from core.world.food_index import FoodIndex
+from core.world.hex_grid import HexGrid
+from core.world.nest import NestLedger
+from core.world.pheromone import PheromoneField, LazyPheromoneField
+
+# Label under which whole model steps are counted; summaries report per-step costs against it
+STEP_LABEL = "Model.step"
+
+# (label, owner class, method). Methods sharing a label are summed.
+DEFAULT_HOOKS = [
+    ("WorkerAgent.step", WorkerAgent, "step"),
+    ("WorkerAgent.update_task", WorkerAgent, "update_task"),
+    ("WorkerAgent.sense_and_move", WorkerAgent, "sense_and_move"),
+    ("WorkerAgent.execute_foraging", WorkerAgent, "execute_foraging"),
+    ("WorkerAgent.execute_returning", WorkerAgent, "execute_returning"),
+    ("WorkerAgent.execute_nursing", WorkerAgent, "execute_nursing"),
+    ("QueenAgent.step", QueenAgent, "step"),
+    ("DroneAgent.step", DroneAgent, "step"),
+    ("Brood.advance", BroodSchedule, "advance"),
+    ("Food.step", FoodLayer, "step"),
+    ("Food.harvest", FoodLayer, "harvest"),
+    ("Pheromones.decay", PheromoneField, "decay"),
+    ("Pheromones.decay", LazyPheromoneField, "decay"),
+    ("DataCollector.collect", mesa.DataCollector, "collect"),
+    ("DataCollector.collect", StreamingCollector, "collect"),
+    ("grid.ants_at", HexGrid, "ants_at"),
+    ("grid.neighbors", HexGrid, "neighbors"),
+    ("nest.is_at_nest", WorkerAgent, "is_at_nest"),
+    ("nest.deposit", NestLedger, "deposit"),
+    ("nest.withdraw", NestLedger, "withdraw"),
+    ("food_index.nearest", FoodIndex, "nearest"),
+]
+
+
+class Profiler:
+    """
+    Call counts and cumulative wall time per hooked method.
+    Times are inclusive: WorkerAgent.step contains its behaviours and queries.
+    Pass the model to also time its whole steps; Mesa binds model.step per
+    instance at construction, so it is hooked on the instance.
+    """
+    def __init__(self, model=None, hooks=None):
+        self.hooks = list(DEFAULT_HOOKS if hooks is None else hooks)
+        if model is not None:
+            self.hooks.insert(0, (STEP_LABEL, model, "step"))
+        self.calls = defaultdict(int)
+        self.totals = defaultdict(float)
+        self._patched = []
+
+    @property
+    def enabled(self):
+        return bool(self._patched)
+
+    def _wrap(self, label, func):
+        calls, totals, clock = self.calls, self.totals, time.perf_counter
+
+        def timed(*args, **kwargs):
+            start = clock()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                totals[label] += clock() - start
+                calls[label] += 1
+        timed.__wrapped__ = func
+        return timed
+
+    def enable(self):
+        if self.enabled: return
+        for label, owner, name in self.hooks:
+            self._patched.append((owner, name, owner.__dict__.get(name)))
+            setattr(owner, name, self._wrap(label, getattr(owner, name)))
+
+    def disable(self):
+        # Restore in reverse so a method hooked twice ends up as the original
+        for owner, name, original in reversed(self._patched):
+            if original is None:
+                delattr(owner, name)
+            else:
+                setattr(owner, name, original)
+        self._patched = []
+
+    def reset(self):
+        self.calls.clear()
+        self.totals.clear()
+
+    def report(self):
+        """{label: {"calls": n, "total_ms": ms}} for every hook label, in hook order."""
+        labels = dict.fromkeys(label for label, _, _ in self.hooks)
+        return {label: {"calls": self.calls[label], "total_ms": self.totals[label] * 1000.0}
+                for label in labels}
+
+    def summary(self, top=None):
+        return format_report(self.report(), top)
+
+    def __enter__(self):
+        self.enable()
+        return self
+
+    def __exit__(self, *exc):
+        self.disable()
+
+
+def merge_reports(reports):
+    """Sums several report() dicts, e.g. from the runs of a sweep."""
+    merged = {}
+    for report in reports:
+        for label, entry in report.items():
+            total = merged.setdefault(label, {"calls": 0, "total_ms": 0.0})
+            total["calls"] += entry["calls"]
+            total["total_ms"] += entry["total_ms"]
+    return merged
+
+
+def format_report(report, top=None):
+    """Text table sorted by cumulative time, with ms per model step where steps were counted."""
+    steps = report.get(STEP_LABEL, {}).get("calls", 0)
+    rows = sorted(report.items(), key=lambda item: item[1]["total_ms"], reverse=True)
+    lines = [f"{'':30} {'calls':>10} {'total ms':>10} {'ms/step':>8}"]
+    for label, entry in rows[:top]:
+        per_step = entry["total_ms"] / steps if steps else 0.0
+        lines.append(f"{label:30} {entry['calls']:>10} {entry['total_ms']:>10.1f} {per_step:>8.3f}")
+    return "\n".join(lines)
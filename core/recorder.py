@@ -0,0 +1,121 @@
+"""
+Streaming data collection for AntColonyModel.
+A drop-in replacement for model.datacollector that samples the same model
+reporters every N steps and appends them to disk in batches, so memory stays
+constant however long the run. Writes Parquet when pyarrow is installed and
+falls back to CSV otherwise.
+"""
+import csv
+import os
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+
+from core.agents.base_ant import BaseAnt
+from core.model import MODEL_REPORTERS
+
+AGENT_COLUMNS = ["Step", "AgentID", "Caste", "x", "y", "State", "Energy", "Health", "Age"]
+
+
+class TableWriter:
+    """Appends batches of rows to one Parquet or CSV file."""
+    def __init__(self, path, columns):
+        self.path = path
+        self.columns = columns
+        self._writer = None
+        self._file = None
+
+    def write(self, rows):
+        if not rows: return
+        if pa is not None:
+            table = pa.Table.from_pydict({c: [r[i] for r in rows] for i, c in enumerate(self.columns)})
+            if self._writer is None:
+                self._writer = pq.ParquetWriter(self.path, table.schema)
+            self._writer.write_table(table)
+        else:
+            if self._file is None:
+                self._file = open(self.path, "w", newline="")
+                self._writer = csv.writer(self._file)
+                self._writer.writerow(self.columns)
+            self._writer.writerows(rows)
+            self._file.flush()
+
+    def close(self):
+        if pa is not None and self._writer is not None:
+            self._writer.close()
+        if self._file is not None:
+            self._file.close()
+        self._writer = self._file = None
+
+
+class StreamingCollector:
+    """
+    Samples model reporters every `interval` steps and writes them out every
+    `flush_every` samples. With `agent_interval`, also writes one row per ant
+    every `agent_interval` steps to a sibling "<name>_agents" file.
+
+    Attach it in place of the in-memory collector and close it when done:
+        model.datacollector = StreamingCollector("run.parquet", interval=10)
+    """
+    def __init__(self, path, interval=1, flush_every=500, agent_interval=None, reporters=None):
+        root = os.path.splitext(path)[0]
+        ext = ".parquet" if pa is not None else ".csv"
+        self.path = root + ext
+        self.interval = interval
+        self.flush_every = flush_every
+        self.agent_interval = agent_interval
+        self.reporters = reporters or MODEL_REPORTERS
+
+        self.model_writer = TableWriter(self.path, ["Step"] + list(self.reporters))
+        self.agent_writer = None
+        if agent_interval:
+            self.agent_path = root + "_agents" + ext
+            self.agent_writer = TableWriter(self.agent_path, AGENT_COLUMNS)
+
+        self.model_rows = []
+        self.agent_rows = []
+
+    def collect(self, model):
+        """Called by the model once per step; only records on sampling steps."""
+        step = model.steps
+        if step % self.interval == 0:
+            row = [step]
+            for reporter in self.reporters.values():
+                row.append(getattr(model, reporter) if isinstance(reporter, str) else reporter(model))
+            self.model_rows.append(row)
+        if self.agent_writer is not None and step % self.agent_interval == 0:
+            self.collect_agents(model, step)
+        if len(self.model_rows) + len(self.agent_rows) >= self.flush_every:
+            self.flush()
+
+    def collect_agents(self, model, step):
+        for agent_type, agents in model.agents_by_type.items():
+            if not issubclass(agent_type, BaseAnt): continue
+            caste = agent_type.caste.__name__
+            for ant in agents:
+                if ant.pos is None: continue
+                self.agent_rows.append([step, ant.unique_id, caste, ant.pos[0], ant.pos[1],
+                                        ant.state, float(ant.energy), float(ant.health), int(ant.age)])
+
+    def flush(self):
+        """Writes buffered rows to disk and empties the buffers."""
+        self.model_writer.write(self.model_rows)
+        self.model_rows = []
+        if self.agent_writer is not None:
+            self.agent_writer.write(self.agent_rows)
+            self.agent_rows = []
+
+    def close(self):
+        self.flush()
+        self.model_writer.close()
+        if self.agent_writer is not None:
+            self.agent_writer.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,60 @@
+import heapq
+import itertools
+
+
+class ActiveScheduler:
+    """
+    Steps only the agents that have something to do this tick.
+
+    Agents of scheduled classes join the active set when they register. An
+    agent with nothing to do calls sleep() with the tick it next needs to act
+    (or None to wait for an event) and is skipped until then; events such as
+    a harvest call wake() to bring it back early. Active agents are stepped in
+    a fresh random order every tick, as with AgentSet.shuffle_do.
+    """
+    def __init__(self, model):
+        self.model = model
+        self.active = {}    # agent -> None (ordered set)
+        self.sleeping = {}  # agent -> wake tick, or None until woken by an event
+        self.alarms = []    # heap of (tick, seq, agent); stale entries are skipped
+        self._seq = itertools.count()
+
+    def __len__(self):
+        return len(self.active)
+
+    def add(self, agent):
+        self.active[agent] = None
+
+    def discard(self, agent):
+        self.active.pop(agent, None)
+        self.sleeping.pop(agent, None)
+
+    def sleep(self, agent, until=None):
+        """Removes agent from the active set until tick `until` (None: until woken)."""
+        if agent not in self.active and agent not in self.sleeping: return # already removed
+        self.active.pop(agent, None)
+        self.sleeping[agent] = until
+        if until is not None:
+            heapq.heappush(self.alarms, (until, next(self._seq), agent))
+
+    def wake(self, agent):
+        if agent in self.sleeping:
+            del self.sleeping[agent]
+            self.active[agent] = None
+
+    def is_sleeping(self, agent):
+        return agent in self.sleeping
+
+    def step(self):
+        """Wakes agents whose alarm is due, then steps the active set in random order."""
+        now = self.model.steps
+        alarms = self.alarms
+        while alarms and alarms[0][0] <= now:
+            tick, _, agent = heapq.heappop(alarms)
+            if self.sleeping.get(agent, -1) == tick:
+                self.wake(agent)
+
+        agents = list(self.active)
+        self.model.random.shuffle(agents)
+        for agent in agents:
+            agent.step()
@@ -0,0 +1,387 @@
+"""
+Spatial domain decomposition for worlds too large for one process.
+The map is cut into horizontal bands (tiles), each simulated by its own
+TileModel with its own pheromone, food and nest arrays. Every tile also holds
+`halo` ghost rows of each neighbouring band. Once per tick the tiles:
+  1. take in the edge rows their neighbours sent as ghost rows,
+  2. apply food changes neighbours made to their rows, food seeded by the
+     coordinator and the ants that crossed into them,
+  3. step as an ordinary AntColonyModel,
+  4. send back their own edge rows, the ants now standing in ghost rows and
+     the food changes made to ghost cells.
+An ant moves at most one cell per tick, so a halo of at least one row is
+enough for movement. The default of four also covers a worker's scent radius.
+
+ShardedWorld routes this traffic between tiles. With processes=1 every tile
+runs in the calling process; otherwise each tile runs in its own worker
+process. Both give the same results for the same seed.
+World-level decisions stay with the coordinator, so the world behaves as one
+colony: food seeding, and the world-wide worker count and stockpile of the
+previous tick, from which every tile derives the colony phase and its task
+weights. Brood counts in the task weights stay per tile, i.e. per nest.
+
+Food taken from a ghost cell is sent to the owner as a change and also kept
+on the ghost copy until the owner's edge rows reflect it, so a harvest is
+never offered twice. The one remaining approximation is two tiles taking
+the same cell within one tick: the owner cannot give back more than it
+held, and each tile counts the shortfall in `food_overdrawn`.
+Several nest sites give one polydomous colony. Each nest starts with a queen
+and the initial workers, and returning foragers head for the nearest nest.
+"""
+import bisect
+import multiprocessing
+import random
+
+import numpy as np
+import pandas as pd
+
+from core.model import AntColonyModel
+from core.agents.worker import WorkerAgent
+from core.agents.queen import QueenAgent
+from core.agents.physiology import PHYSIOLOGY_ATTRS
+from core.world.cell import NestCell
+from core.world.nest import NestLedger
+from core.world.hex_grid import hex_distance
+
+NEST_RADIUS = 2             # nests cover the 5x5 block around their center
+FOOD_SEED_CHANCE = 0.005    # per-tick chance of a new food seed, as in AntColonyModel.step
+INITIAL_FOOD_SEEDS = 8
+NEST_CLEARANCE = 10         # food never seeds this close (per axis) to a nest center
+
+
+def split_rows(height, tiles):
+    """Row boundaries [0, ..., height] of `tiles` bands as equal as possible."""
+    return [round(i * height / tiles) for i in range(tiles + 1)]
+
+
+class TileModel(AntColonyModel):
+    """
+    One band of a sharded world, rows y0..y1-1 of the world, plus up to `halo`
+    ghost rows on either side. Positions are local: local y = world y - origin.
+    Ghost rows hold copies of the neighbours' cells. Their food is not stepped
+    here, and changes made to them go back to the owner.
+    """
+    def __init__(self, index, y0, y1, world_height, halo=4, nests=(), width=50, **params):
+        self.index = index
+        self.halo = halo
+        self.origin = max(0, y0 - halo)
+        self.owned = (y0 - self.origin, y1 - self.origin)   # local rows this tile owns
+        # Nest centers in local coordinates. Centers of nests owned by other tiles may fall outside this grid.
+        self.nest_sites = [(x, y - self.origin) for x, y in nests]
+        self.local_sites = [(x, y) for x, y in self.nest_sites if self.owned[0] <= y < self.owned[1]]
+        self.world_totals = None
+        self.food_overdrawn = 0.0   # food taken from ghost cells that the owner no longer had
+        self._pending_food = []     # changes made to ghost cells last tick, not yet in the owner's edge rows
+        height = min(world_height, y1 + halo) - self.origin
+        super().__init__(width=width, height=height, **params)
+
+        self.food.active = np.zeros((self.width, self.height), dtype=bool)
+        self.food.active[:, self.owned[0]:self.owned[1]] = True
+        self.ghost_rows = [(lo, hi) for lo, hi in ((0, self.owned[0]), (self.owned[1], self.height)) if hi > lo]
+        self._ghost_food = {}
+
+    def create_environment(self):
+        self.nest_center = self.local_sites[0] if self.local_sites else None
+        # The mask covers every nest reaching into this grid, ghost rows included,
+        # so food never spreads or lands on a neighbour's nest cells
+        self.nest_mask = np.zeros((self.width, self.height), dtype=bool)
+        for cx, cy in self.nest_sites:
+            self.nest_mask[max(0, cx - NEST_RADIUS):cx + NEST_RADIUS + 1,
+                           max(0, cy - NEST_RADIUS):max(0, cy + NEST_RADIUS + 1)] = True
+        for cx, cy in self.local_sites:
+            for x in range(max(0, cx - NEST_RADIUS), min(self.width, cx + NEST_RADIUS + 1)):
+                for y in range(cy - NEST_RADIUS, cy + NEST_RADIUS + 1):
+                    self.grid.place_agent(NestCell(self), (x, y))
+        self.nest = NestLedger(list(self.grid.env), self.grid.distance, center=self.nest_center)
+        self.build_homing_tables()
+        # Food is seeded by the coordinator
+
+    def build_homing_tables(self):
+        """As AntColonyModel, but towards the nearest nest of the whole world."""
+        self.homing_field = {}
+        self.nest_neighbors = {}
+        sites = self.nest_sites
+        for x in range(self.width):
+            for y in range(self.height):
+                neighbors = self.grid.neighbors((x, y))
+                self.homing_field[(x, y)] = min(neighbors, key=lambda n: min(hex_distance(n, s) for s in sites))
+                if (x, y) in self.grid.env:
+                    self.nest_neighbors[(x, y)] = [n for n in neighbors if n in self.grid.env]
+
+    def spawn_initial_colony(self, initial_workers):
+        for site in self.local_sites:
+            self.grid.place_agent(QueenAgent(self), site)
+            for _ in range(initial_workers):
+                self.grid.place_agent(WorkerAgent(self), site)
+
+    def distribute_initial_food(self, amount):
+        super().distribute_initial_food(amount * len(self.local_sites))
+
+    def spawn_random_food(self):
+        """Food is seeded by the coordinator (see ShardedWorld), which sends it in the inbox."""
+
+    def colony_totals(self):
+        if self.world_totals is None:
+            return super().colony_totals()
+        return self.world_totals
+
+    def exchange(self, inbox):
+        """
+        Runs one tick: applies `inbox` (ghost rows, food changes and seeds, ants,
+        world totals), steps, and returns this tile's outbox for the coordinator.
+        All positions in the inbox and outbox are world positions.
+        """
+        origin = self.origin
+        # 1. Ghost rows from the neighbours' edges
+        for y0, pheromone, food in inbox.get("ghosts", ()):
+            self.pheromones.set_rows(y0 - origin, pheromone)
+            self.food.set_rows(y0 - origin, food)
+        for pos, delta in self._pending_food:
+            self.food.adjust(pos, delta)
+        # 2. Changes to owned cells: food taken or spread from a neighbour's halo, new seeds, arriving ants
+        for (x, y), delta in inbox.get("food", ()):
+            if not self.nest_mask[x, y - origin]:
+                self.food_overdrawn += self.food.adjust((x, y - origin), delta)
+        for (x, y), amount in inbox.get("seeds", ()):
+            if self.is_free_for_food((x, y - origin)):
+                self.food.add((x, y - origin), amount)
+        for caste, (x, y), traits in inbox.get("ants", ()):
+            ant = caste(self)
+            for name, value in traits.items():
+                setattr(ant, name, value)
+            self.grid.place_agent(ant, (x, y - origin))
+        self.world_totals = inbox.get("totals")
+        for lo, hi in self.ghost_rows:
+            self._ghost_food[lo] = self.food.get_rows(lo, hi)
+
+        # 3. The tick itself
+        self.step()
+
+        # 4. Outbox: ants in ghost rows, food changes in ghost rows, own edge rows
+        outbox = {"ants": [], "food": [], "edges": [],
+                  "totals": (self.ant_counts[WorkerAgent], self.total_food_stockpile),
+                  "overdrawn": self.food_overdrawn}
+        self._pending_food = []
+        for lo, hi in self.ghost_rows:
+            crossing = [ant for x in range(self.width) for y in range(lo, hi)
+                        for ant in self.grid.ants_at((x, y))]
+            # Sorted so the receiving tile registers them in the same order every run
+            for ant in sorted(crossing, key=lambda a: a.unique_id):
+                outbox["ants"].append((ant.caste, (ant.pos[0], ant.pos[1] + origin), self.traits(ant)))
+                ant.remove()
+            delta = self.food.get_rows(lo, hi) - self._ghost_food[lo]
+            for x, y in zip(*np.nonzero(delta)):
+                outbox["food"].append(((int(x), int(y) + lo + origin), float(delta[x, y])))
+                self._pending_food.append(((int(x), int(y) + lo), float(delta[x, y])))
+        top, bottom = self.owned
+        if top > 0:   # a neighbour above holds rows up to ours as its ghosts
+            outbox["edges"].append((-1, top + origin, self.pheromones.get_rows(top, top + self.halo),
+                                    self.food.get_rows(top, top + self.halo)))
+        if bottom < self.height:
+            outbox["edges"].append((1, bottom - self.halo + origin, self.pheromones.get_rows(bottom - self.halo, bottom),
+                                    self.food.get_rows(bottom - self.halo, bottom)))
+        return outbox
+
+    @staticmethod
+    def traits(ant):
+        """Everything an ant carries to another tile, apart from its identity and position."""
+        traits = {name: getattr(ant, name) for name in PHYSIOLOGY_ATTRS}
+        traits.update((name, value) for name, value in vars(ant).items()
+                      if name not in ("model", "unique_id", "pos") and not name.startswith("_"))
+        return traits
+
+    def fields(self):
+        """Owned rows of the pheromone and food layers, as (world y0, pheromone, food)."""
+        lo, hi = self.owned
+        return lo + self.origin, self.pheromones.get_rows(lo, hi), self.food.get_rows(lo, hi)
+
+    def results(self):
+        """This tile's collected model-level series."""
+        return self.datacollector.get_model_vars_dataframe()
+
+
+class TileHost:
+    """Holds tiles and runs commands on them; lives in a worker process or in the coordinator."""
+    def __init__(self, specs):
+        self.tiles = {spec["index"]: TileModel(**spec) for spec in specs}
+
+    def handle(self, command, payloads):
+        return {i: getattr(self.tiles[i], command)(*payloads.get(i, ())) for i in self.tiles}
+
+
+def _serve(conn, specs):
+    host = TileHost(specs)
+    while True:
+        command, payloads = conn.recv()
+        if command == "close": break
+        conn.send(host.handle(command, payloads))
+    conn.close()
+
+
+class ShardedWorld:
+    """
+    A width x height world split into `tiles` bands with `halo` ghost rows each.
+    `nests` lists nest centers in world coordinates (default: one in the
+    middle, shifted off a tile border if need be). Each nest's 5x5 block must
+    lie within one band. Remaining keyword
+    arguments go to every TileModel as AntColonyModel parameters. Tile i is
+    seeded with seed + i.
+    processes=1 runs every tile in this process; otherwise each tile gets its own process.
+    Use as a context manager, or call close(), to stop the worker processes.
+    """
+    def __init__(self, width=50, height=50, tiles=2, halo=4, nests=None, processes=None, seed=None, **params):
+        bounds = split_rows(height, tiles)
+        if min(b - a for a, b in zip(bounds, bounds[1:])) < max(halo, 1):
+            raise ValueError(f"{tiles} tiles over {height} rows leaves bands thinner than the halo ({halo})")
+        if halo < 1:
+            raise ValueError("halo must be at least one row")
+        if not nests:
+            # One nest in the middle, moved into the band holding the middle row if it would straddle a border
+            band = bisect.bisect_right(bounds, height // 2) - 1
+            cy = min(max(height // 2, bounds[band] + NEST_RADIUS), bounds[band + 1] - NEST_RADIUS - 1)
+            nests = [(width // 2, cy)]
+        nests = list(nests)
+        for cx, cy in nests:
+            top = bisect.bisect_right(bounds, cy - NEST_RADIUS) - 1
+            if not 0 <= cx < width or cy - NEST_RADIUS < 0 or cy + NEST_RADIUS >= bounds[top + 1]:
+                raise ValueError(f"nest at {(cx, cy)} must lie inside the map and within one tile")
+
+        self.width = width
+        self.height = height
+        self.bounds = bounds
+        self.nests = nests
+        self.steps = 0
+        self.random = random.Random(seed)
+        self.totals = None
+        self.food_overdrawn = 0.0   # see TileModel.food_overdrawn
+
+        specs = [dict(index=i, y0=bounds[i], y1=bounds[i + 1], world_height=height, halo=halo, nests=nests,
+                      width=width, seed=None if seed is None else seed + i, **params)
+                 for i in range(tiles)]
+        self.hosts = []
+        if processes == 1:
+            self.hosts.append((TileHost(specs), None))
+        else:
+            for spec in specs:
+                conn, child = multiprocessing.Pipe()
+                process = multiprocessing.Process(target=_serve, args=(child, [spec]), daemon=True)
+                process.start()
+                child.close()
+                self.hosts.append((conn, process))
+
+        self.inboxes = [{} for _ in range(tiles)]
+        for _ in range(INITIAL_FOOD_SEEDS):
+            self.seed_food()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _call(self, command, payloads=None):
+        """Runs `command` on every tile (in parallel across processes) and returns {tile: result}."""
+        payloads = payloads or {}
+        results = {}
+        for host, process in self.hosts:
+            if process is None:
+                results.update(host.handle(command, payloads))
+            else:
+                host.send((command, payloads))
+        for host, process in self.hosts:
+            if process is not None:
+                results.update(host.recv())
+        return results
+
+    def owner(self, y):
+        """The tile that owns world row y."""
+        return bisect.bisect_right(self.bounds, y) - 1
+
+    def seed_food(self):
+        """One seeding attempt, drawn as AntColonyModel.spawn_random_food does for the whole map."""
+        fx = self.random.randint(0, self.width - 1)
+        fy = self.random.randint(0, self.height - 1)
+        if any(abs(fx - cx) < NEST_CLEARANCE and abs(fy - cy) < NEST_CLEARANCE for cx, cy in self.nests):
+            return
+        amount = self.random.randint(50, 150)
+        self.inboxes[self.owner(fy)].setdefault("seeds", []).append(((fx, fy), amount))
+
+    def step(self):
+        if self.random.random() < FOOD_SEED_CHANCE:
+            self.seed_food()
+        for inbox in self.inboxes:
+            inbox["totals"] = self.totals
+
+        outboxes = self._call("exchange", {i: (inbox,) for i, inbox in enumerate(self.inboxes)})
+        self.steps += 1
+
+        # Route each tile's outbox into next tick's inboxes
+        self.inboxes = [{} for _ in self.inboxes]
+        workers = food = 0
+        self.food_overdrawn = sum(outbox["overdrawn"] for outbox in outboxes.values())
+        for i in sorted(outboxes):
+            outbox = outboxes[i]
+            for ant in outbox["ants"]:
+                self.inboxes[self.owner(ant[1][1])].setdefault("ants", []).append(ant)
+            for change in outbox["food"]:
+                self.inboxes[self.owner(change[0][1])].setdefault("food", []).append(change)
+            for side, y0, pheromone, amounts in outbox["edges"]:
+                self.inboxes[i + side].setdefault("ghosts", []).append((y0, pheromone, amounts))
+            workers += outbox["totals"][0]
+            food += outbox["totals"][1]
+        self.totals = (workers, food)
+
+    def run(self, steps):
+        for _ in range(steps):
+            self.step()
+
+    def fields(self):
+        """The whole map's pheromone levels and food amounts as (width, height) arrays."""
+        pheromones = np.zeros((self.width, self.height))
+        food = np.zeros((self.width, self.height))
+        for y0, pheromone_rows, food_rows in self._call("fields").values():
+            pheromones[:, y0:y0 + pheromone_rows.shape[1]] = pheromone_rows
+            food[:, y0:y0 + food_rows.shape[1]] = food_rows
+        return pheromones, food
+
+    def results(self, per_tile=False):
+        """
+        Model-level series of the whole world: counts and stockpile summed over
+        tiles, one row per step. With `per_tile`, each tile's own rows instead, with a Tile column.
+        """
+        frames = []
+        for i, df in sorted(self._call("results").items()):
+            df = df.reset_index(drop=True)
+            df.insert(0, "Step", range(1, len(df) + 1))
+            df.insert(0, "Tile", i)
+            frames.append(df)
+        tiles = pd.concat(frames, ignore_index=True)
+        if per_tile:
+            return tiles
+        world = tiles.drop(columns=["Tile", "Phase"]).groupby("Step", as_index=False).sum()
+        world["Phase"] = frames[0]["Phase"].values
+        return world
+
+    def close(self):
+        for host, process in self.hosts:
+            if process is not None:
+                host.send(("close", None))
+                process.join()
+                host.close()
+        self.hosts = []
+
+
+def run_sharded(params, steps, tiles=2, halo=4, nests=None, processes=None):
+    """
+    Runs one sharded world for `steps` ticks and returns its world-level
+    series as run_model does for a single model. `params` must include width
+    and height; the rest (seed included) are model parameters.
+    """
+    params = dict(params)
+    with ShardedWorld(tiles=tiles, halo=halo, nests=nests, processes=processes, **params) as world:
+        world.run(steps)
+        df = world.results()
+    for name, value in params.items():
+        df[name] = value
+    return df
+
@@ -0,0 +1,51 @@
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from core.agents.worker import WorkerAgent
+from core.agents.queen import QueenAgent
+from core.agents.drone import DroneAgent
+
+# Castes the renderer draws, by the name stored in ModelSnapshot.ants
+DRAWN_CASTES = {"WORKER": WorkerAgent, "QUEEN": QueenAgent, "DRONE": DroneAgent}
+
+
+@dataclass
+class ModelSnapshot:
+    """
+    A consistent copy of everything the renderer reads from one model step.
+    Captured between steps, so a viewer on another thread never sees a model mid-step.
+    """
+    steps: int
+    phase: str
+    ant_count: int
+    food_stockpile: float
+    brood_count: int
+    ants: dict                  # unique_id -> (caste, pos)
+    food_cells: frozenset       # positions holding non-empty food
+    nest_fill: dict             # nest pos -> stored_food / food_capacity
+    pheromones: np.ndarray      # copy of the pheromone field
+    dirty_cells: set = field(default_factory=set)
+
+    @classmethod
+    def capture(cls, model, dirty_cells=None):
+        ants = {}
+        for caste, caste_cls in DRAWN_CASTES.items():
+            # Array-engine handles are subclasses of their caste class
+            for agent_cls, agents in model.agents_by_type.items():
+                if issubclass(agent_cls, caste_cls):
+                    for agent in agents:
+                        ants[agent.unique_id] = (caste, agent.pos)
+
+        return cls(
+            steps=model.steps,
+            phase=model.phase,
+            ant_count=model.ant_count,
+            food_stockpile=model.total_food_stockpile,
+            brood_count=model.brood_count,
+            ants=ants,
+            food_cells=frozenset(model.food.index.cells),
+            nest_fill=model.nest.fill(),
+            pheromones=model.pheromones.levels.copy(),
+            dirty_cells=set(dirty_cells or ()),
+        )
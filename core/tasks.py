@@ -0,0 +1,70 @@
+import numpy as np
+
+TASKS = ("FORAGING", "NURSING", "IDLE")
+
+
+class TaskAllocator:
+    """
+    Colony-level task allocation for workers.
+    The propensities depend only on colony needs (phase, stockpile, brood), so
+    they are computed once per tick. Decisions for every worker re-tasking that
+    tick come from one vectorized draw: each uniform maps to a task through the
+    cumulative weights, exactly as random.choices would, and is consumed in
+    turn by update_task. The pool is drawn on first use, sized by how many
+    decisions the previous tick needed, and refilled if a busy tick runs through it.
+    """
+    def __init__(self, model):
+        self.model = model
+        self.weights = (0.4, 0.3, 0.3)
+        self._tasks = []      # pre-drawn decisions
+        self._leaving = []    # the same draws with IDLE excluded
+        self._next = 0
+        self._used = 0        # decisions taken this tick
+        self._demand = 32     # pool size to draw next
+
+    def refresh(self):
+        """Recomputes the weights from colony needs and discards last tick's pool."""
+        self.weights = self.compute_weights()
+        used = self._used + self._next
+        self._demand = max(32, used + used // 4)
+        self._tasks = self._leaving = []
+        self._next = self._used = 0
+
+    def compute_weights(self):
+        """Propensities for [FORAGING, NURSING, IDLE] based on colony needs."""
+        model = self.model
+        _, food_level = model.colony_totals()
+        brood_count = model.brood_count
+
+        f_weight = 0.4
+        n_weight = 0.3
+        i_weight = 0.3
+
+        if model.phase == "FOUNDING":
+            if food_level < 50: f_weight += 0.8
+            if brood_count > 0: n_weight += 0.4
+        elif model.phase == "ERGONOMIC":
+            if food_level < 150: f_weight += 0.5
+            if brood_count > 10: n_weight += 0.7
+        else: # Reproductive
+            if food_level < 500: f_weight += 1.0
+            if brood_count > 20: n_weight += 0.3
+
+        return (f_weight, n_weight, i_weight)
+
+    def _draw(self):
+        self._used += self._next
+        u = self.model.rng.random(self._demand)
+        cum = np.cumsum(self.weights)
+        tasks = np.array(TASKS)
+        self._tasks = tasks[np.searchsorted(cum, u * cum[-1], side="right")].tolist()
+        self._leaving = tasks[np.searchsorted(cum[:2], u * cum[1], side="right")].tolist()
+        self._next = 0
+
+    def draw(self, leave_idle=False):
+        """Next task decision; `leave_idle` excludes IDLE (end of a drawn idle spell)."""
+        if self._next >= len(self._tasks):
+            self._draw()
+        i = self._next
+        self._next += 1
+        return self._leaving[i] if leave_idle else self._tasks[i]
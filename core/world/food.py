@@ -0,0 +1,132 @@
+import numpy as np
+
+from core.world.food_index import FoodIndex
+
+
+class FoodLayer:
+    """
+    Food patches held as grid arrays instead of agents.
+    `amount` is the food left in each cell and `initial` the amount the patch
+    was seeded with (0 where there is no food). Once per tick every patch rolls
+    regrowth and spreading in one vectorized pass; harvesting a patch to zero
+    clears it at once. A FoodIndex over the non-empty cells serves scent queries.
+    """
+    def __init__(self, width, height, distance, neighbor_index,
+                 regrowth_chance=0.005, expansion_chance=0.005, spread_amount=20):
+        self.width = width
+        self.height = height
+        self.amount = np.zeros((width, height), dtype=np.float64)
+        self.initial = np.zeros((width, height), dtype=np.float64)
+        self.neighbor_index = neighbor_index   # HexGrid.neighbor_index
+        self.neighbor_counts = (neighbor_index >= 0).sum(axis=1)
+        self.regrowth_chance = regrowth_chance
+        self.expansion_chance = expansion_chance # Probability to spread per tick
+        self.spread_amount = spread_amount
+        self.index = FoodIndex(distance)
+        # Cells stepped by this layer (None: all). A sharded tile leaves its halo rows to their owner.
+        self.active = None
+        self.changed = set()   # cells whose food changed since the last pop_changed()
+
+    def has(self, pos):
+        """True if pos holds food that can be harvested."""
+        return self.amount[pos] > 0
+
+    def add(self, pos, amount):
+        """Seeds a new patch at pos."""
+        self.amount[pos] = amount
+        self.initial[pos] = amount
+        self.index.add(pos)
+        self.changed.add(pos)
+
+    def harvest(self, pos, amount):
+        """Takes up to `amount` from the patch at pos; an emptied patch is removed."""
+        left = self.amount[pos]
+        gathered = min(left, amount)
+        left -= gathered
+        self.changed.add(pos)
+        if left <= 0:
+            self.amount[pos] = 0.0
+            self.initial[pos] = 0.0
+            self.index.discard(pos)
+        else:
+            self.amount[pos] = left
+        return float(gathered)
+
+    def adjust(self, pos, delta):
+        """
+        Applies a change made to a copy of this cell elsewhere (a sharded tile's halo).
+        Returns how much of a negative change was not there to take (0 if it all was).
+        """
+        if delta < 0:
+            left = self.amount[pos]
+            if left <= 0: return -delta
+            self.changed.add(pos)
+            if left + delta <= 0:
+                self.amount[pos] = 0.0
+                self.initial[pos] = 0.0
+                self.index.discard(pos)
+                return float(-delta - left)
+            self.amount[pos] = left + delta
+        elif delta > 0:
+            if self.amount[pos] > 0:
+                self.amount[pos] += delta
+                self.changed.add(pos)
+            else:
+                self.add(pos, delta)
+        return 0.0
+
+    def get_rows(self, y0, y1):
+        """Copy of the food amounts in rows y0..y1-1 (halo exchange, see core.sharding)."""
+        return self.amount[:, y0:y1].copy()
+
+    def set_rows(self, y0, block):
+        """Overwrites the rows from y0 with `block`, keeping the index in step."""
+        y1 = y0 + block.shape[1]
+        old = self.amount[:, y0:y1]
+        for x, y in zip(*np.nonzero((old > 0) != (block > 0))):
+            pos = (int(x), int(y) + y0)
+            if block[x, y] > 0:
+                self.index.add(pos)
+            else:
+                self.index.discard(pos)
+        for x, y in zip(*np.nonzero(old != block)):
+            self.changed.add((int(x), int(y) + y0))
+        self.amount[:, y0:y1] = block
+        self.initial[:, y0:y1] = block
+
+    def step(self, rng, blocked):
+        """
+        Regrowth and spreading for every patch.
+        A patch below its initial amount regrows 1 with regrowth_chance; one above
+        50 then spreads spread_amount to a random neighbour with expansion_chance
+        if that neighbour is free (no food, not `blocked`, e.g. the nest mask).
+        """
+        amount = self.amount.ravel()
+        initial = self.initial.ravel()
+        cells = np.flatnonzero(amount)
+        if self.active is not None:
+            cells = cells[self.active.ravel()[cells]]
+        if not len(cells): return
+
+        # 1. Self-Regrowth
+        regrow = cells[(amount[cells] < initial[cells]) & (rng.random(len(cells)) < self.regrowth_chance)]
+        if len(regrow):
+            amount[regrow] += 1
+            self.changed.update(divmod(int(c), self.height) for c in regrow)
+
+        # 2. Outward Growth: targets drawn together, applied in turn so two spreads can't share a cell
+        spreaders = cells[(amount[cells] > 50) & (rng.random(len(cells)) < self.expansion_chance)]
+        if not len(spreaders): return
+        picks = (rng.random(len(spreaders)) * self.neighbor_counts[spreaders]).astype(np.int64)
+        targets = self.neighbor_index[spreaders, picks]
+        blocked = blocked.ravel()
+        for source, target in zip(spreaders.tolist(), targets.tolist()):
+            if blocked[target] or amount[target] > 0: continue
+            if amount[source] > self.spread_amount + 10:
+                amount[source] -= self.spread_amount
+                self.add(divmod(target, self.height), self.spread_amount)
+                self.changed.add(divmod(source, self.height))
+
+    def pop_changed(self):
+        changed, self.changed = self.changed, set()
+        return changed
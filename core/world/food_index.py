@@ -0,0 +1,54 @@
+from collections import defaultdict
+
+class FoodIndex:
+    """
+    Spatial hash of the cells holding food, bucketed on a coarse grid.
+    Kept current by FoodLayer on seeding, spreading and depletion so that
+    scent sensing only visits the few buckets overlapping the scent radius.
+    Distances are measured with `distance` (the grid's, in hex steps).
+    """
+    def __init__(self, distance, bucket_size=4):
+        self.distance = distance
+        self.bucket_size = bucket_size
+        self.cells = set()              # {pos, ...}
+        self.buckets = defaultdict(set) # (bx, by) -> {pos, ...}
+
+    def __len__(self):
+        return len(self.cells)
+
+    def _bucket(self, pos):
+        return (pos[0] // self.bucket_size, pos[1] // self.bucket_size)
+
+    def __contains__(self, pos):
+        return pos in self.cells
+
+    def add(self, pos):
+        self.cells.add(pos)
+        self.buckets[self._bucket(pos)].add(pos)
+
+    def discard(self, pos):
+        if pos not in self.cells: return
+        self.cells.discard(pos)
+        bucket = self._bucket(pos)
+        self.buckets[bucket].discard(pos)
+        if not self.buckets[bucket]:
+            del self.buckets[bucket]
+
+    def nearest(self, pos, radius):
+        """
+        Nearest non-empty food within `radius` steps of pos (center excluded).
+        Ties resolve in grid order.
+        """
+        x, y = pos
+        size = self.bucket_size
+        best, best_key = None, None
+        for bx in range((x - radius) // size, (x + radius) // size + 1):
+            for by in range((y - radius) // size, (y + radius) // size + 1):
+                for fpos in self.buckets.get((bx, by), ()):
+                    if fpos == pos or abs(fpos[0] - x) > radius or abs(fpos[1] - y) > radius:
+                        continue
+                    key = (self.distance(pos, fpos), fpos)
+                    if key[0] > radius: continue
+                    if best_key is None or key < best_key:
+                        best, best_key = fpos, key
+        return best
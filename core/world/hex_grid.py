@@ -0,0 +1,120 @@
+from collections import defaultdict
+
+import numpy as np
+from mesa.space import MultiGrid
+
+# Neighbour offsets by column parity, clockwise from "up"
+EVEN_OFFSETS = ((0, 1), (1, 0), (1, -1), (0, -1), (-1, -1), (-1, 0))
+ODD_OFFSETS = ((0, 1), (1, 1), (1, 0), (0, -1), (-1, 0), (-1, 1))
+
+
+def hex_distance(a, b):
+    """Number of hex steps between two cells."""
+    # Offset (odd-q) to axial coordinates
+    aq, ar = a[0], a[1] - (a[0] - (a[0] & 1)) // 2
+    bq, br = b[0], b[1] - (b[0] - (b[0] & 1)) // 2
+    dq, dr = bq - aq, br - ar
+    return (abs(dq) + abs(dr) + abs(dq + dr)) // 2
+
+
+class HexGrid(MultiGrid):
+    """
+    MultiGrid with the hex adjacency the renderer draws: odd columns sit half a
+    cell higher (see AntRenderer.get_pixel_pos), so every cell touches (x, y±1),
+    even columns also touch (x±1, y) and (x±1, y-1), and odd columns (x±1, y)
+    and (x±1, y+1).
+    Neighbour tuples are built once for the whole grid, along with the same
+    table as an index array for batched kernels; discs of larger radius are
+    built per cell on first use and kept.
+
+    Each cell also has typed slots, kept current on place/remove/move, so
+    behaviours look up "the nest cell here" or "the ants here" without building
+    and scanning content lists. An agent class picks its slot with `cell_slot`:
+    "env" (one environment cell) or "ants" (a set). Food is not an agent; see
+    core.world.food.FoodLayer.
+    """
+    def __init__(self, width, height):
+        super().__init__(width, height, torus=False)
+        self.adjacency = {}
+        for x in range(width):
+            offsets = ODD_OFFSETS if x & 1 else EVEN_OFFSETS
+            for y in range(height):
+                self.adjacency[(x, y)] = tuple((x + dx, y + dy) for dx, dy in offsets
+                                               if 0 <= x + dx < width and 0 <= y + dy < height)
+        # Row x * height + y lists that cell's neighbours as flat indices, -1 padded
+        self.neighbor_index = np.full((width * height, 6), -1, dtype=np.int64)
+        for (x, y), cells in self.adjacency.items():
+            self.neighbor_index[x * height + y, :len(cells)] = [nx * height + ny for nx, ny in cells]
+        self._disc_offsets = {}  # radius -> (even offsets, odd offsets)
+        self._discs = {1: self.adjacency}
+
+        self.env = {}                  # pos -> environment cell
+        self.ants = defaultdict(set)   # pos -> {ant, ...}; emptied sets are kept for reuse
+
+    distance = staticmethod(hex_distance)
+
+    def neighbors(self, pos):
+        """The up to six cells touching pos."""
+        return self.adjacency[pos]
+
+    def disc(self, pos, radius):
+        """Cells within `radius` steps of pos (center excluded), nearest first."""
+        discs = self._discs.get(radius)
+        if discs is None:
+            discs = self._discs[radius] = {}
+        cells = discs.get(pos)
+        if cells is None:
+            x, y = pos
+            offsets = self._offsets(radius)[x & 1]
+            cells = discs[pos] = tuple((x + dx, y + dy) for dx, dy in offsets
+                                       if 0 <= x + dx < self.width and 0 <= y + dy < self.height)
+        return cells
+
+    def _offsets(self, radius):
+        offsets = self._disc_offsets.get(radius)
+        if offsets is None:
+            offsets = []
+            for parity in (0, 1):
+                ring = [(dx, dy) for dx in range(-radius, radius + 1) for dy in range(-radius, radius + 1)
+                        if 0 < hex_distance((parity, 0), (parity + dx, dy)) <= radius]
+                ring.sort(key=lambda d: (hex_distance((parity, 0), (parity + d[0], d[1])), d))
+                offsets.append(tuple(ring))
+            offsets = self._disc_offsets[radius] = tuple(offsets)
+        return offsets
+
+    def place_agent(self, agent, pos):
+        super().place_agent(agent, pos)
+        slot = getattr(agent, "cell_slot", None)
+        if slot == "ants":
+            self.ants[pos].add(agent)
+        elif slot is not None:
+            getattr(self, slot)[pos] = agent
+
+    def remove_agent(self, agent):
+        slot = getattr(agent, "cell_slot", None)
+        if slot == "ants":
+            self.ants[agent.pos].discard(agent)
+        elif slot is not None:
+            getattr(self, slot).pop(agent.pos, None)
+        super().remove_agent(agent)
+
+    def move_agent(self, agent, pos):
+        # Ants are the movers: update their slot directly instead of a full remove + place
+        if getattr(agent, "cell_slot", None) != "ants":
+            return super().move_agent(agent, pos)
+        ants = self.ants
+        ants[agent.pos].discard(agent)
+        MultiGrid.remove_agent(self, agent)
+        MultiGrid.place_agent(self, agent, pos)
+        ants[pos].add(agent)
+
+    def ants_at(self, pos):
+        """The ants standing at pos."""
+        return self.ants.get(pos, ())
+
+    def get_neighborhood(self, pos, moore=True, include_center=False, radius=1):
+        """Mesa-compatible hex neighbourhood; `moore` has no meaning on hexes and is ignored."""
+        cells = list(self.neighbors(pos) if radius == 1 else self.disc(pos, radius))
+        if include_center:
+            cells.insert(0, pos)
+        return cells
@@ -0,0 +1,77 @@
+import numpy as np
+
+
+class NestLedger:
+    """
+    Food storage of the nest as arrays: one slot per nest cell with its capacity
+    and stored amount, plus the running total.
+    Deposits fill the slots nearest the depositing ant first and withdrawals
+    empty the nearest stocked ones, so an ant anywhere in the nest never walks
+    to find space or food. Each slot's nearest-first order is precomputed;
+    callers outside the nest (drones) share the order from `center`.
+    """
+    def __init__(self, positions, distance, capacity=50.0, center=None):
+        self.positions = list(positions)
+        self.slot_of = {pos: i for i, pos in enumerate(self.positions)}
+        self.distance = distance
+        self.capacity = np.full(len(self.positions), capacity, dtype=np.float64)
+        self.stored = np.zeros(len(self.positions), dtype=np.float64)
+        self.total = 0.0
+        self.total_capacity = float(self.capacity.sum())
+        self.orders = {pos: self._nearest_first(pos) for pos in self.positions}
+        if center not in self.orders and self.positions:
+            center = self.positions[0]
+        self.outside_order = self.orders.get(center, [])
+        self.changed = set()   # nest cells whose store changed since the last pop_changed()
+
+    def _nearest_first(self, pos):
+        return sorted(range(len(self.positions)), key=lambda i: (self.distance(pos, self.positions[i]), i))
+
+    def order(self, pos):
+        """Slots by distance from pos, or from the center for positions outside the nest."""
+        return self.orders.get(pos, self.outside_order)
+
+    def stored_at(self, pos):
+        """Food in the slot at pos (0 outside the nest)."""
+        slot = self.slot_of.get(pos)
+        return 0.0 if slot is None else float(self.stored[slot])
+
+    def deposit(self, pos, amount):
+        """Stores up to `amount`, nearest free slots first. Returns the amount stored."""
+        if amount <= 0 or self.total >= self.total_capacity: return 0.0
+        left = amount
+        for slot in self.order(pos):
+            space = self.capacity[slot] - self.stored[slot]
+            if space <= 0: continue
+            put = min(space, left)
+            self.stored[slot] += put
+            self.changed.add(self.positions[slot])
+            left -= put
+            if left <= 0: break
+        stored = float(amount - left)
+        self.total += stored
+        return stored
+
+    def withdraw(self, pos, amount):
+        """Takes up to `amount`, nearest stocked slots first. Returns the amount taken."""
+        if amount <= 0 or self.total <= 0: return 0.0
+        left = amount
+        for slot in self.order(pos):
+            have = self.stored[slot]
+            if have <= 0: continue
+            take = min(have, left)
+            self.stored[slot] -= take
+            self.changed.add(self.positions[slot])
+            left -= take
+            if left <= 0: break
+        taken = float(amount - left)
+        self.total -= taken
+        return taken
+
+    def fill(self):
+        """{pos: stored / capacity} for every nest cell."""
+        return dict(zip(self.positions, (self.stored / self.capacity).tolist()))
+
+    def pop_changed(self):
+        changed, self.changed = self.changed, set()
+        return changed
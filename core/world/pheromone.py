@@ -0,0 +1,131 @@
+import numpy as np
+
+class PheromoneField:
+    """
+    Dense pheromone layer covering the whole grid.
+    Replaces the per-cell PheromoneCell agents: levels live in one float array
+    and are decayed and clamped in a single vectorized operation per tick.
+    """
+    def __init__(self, width, height, decay_rate=0.03, max_level=100.0):
+        self.width = width
+        self.height = height
+        self.decay_rate = decay_rate
+        self.max_level = max_level
+        self.levels = np.zeros((width, height), dtype=np.float64)
+        # Cells whose level changed since the last pop_changed()
+        self.changed = np.zeros((width, height), dtype=bool)
+
+    def level(self, pos):
+        """Current pheromone level at a grid position."""
+        return float(self.levels[pos[0], pos[1]])
+
+    def levels_at(self, cells):
+        """Current levels at an array of flat cell indices (x * height + y)."""
+        return self.levels.ravel()[cells]
+
+    def add(self, pos, amount):
+        """Deposits pheromone at a position, clamped to max_level."""
+        x, y = pos
+        self.levels[x, y] = min(self.max_level, self.levels[x, y] + amount)
+        self.changed[x, y] = True
+
+    def decay(self):
+        """Naturally decay every cell at once, never dropping below zero."""
+        self.changed |= self.levels > 0
+        np.subtract(self.levels, self.decay_rate, out=self.levels)
+        np.maximum(self.levels, 0.0, out=self.levels)
+
+    def get_rows(self, y0, y1):
+        """Copy of the levels in rows y0..y1-1 (halo exchange, see core.sharding)."""
+        return self.levels[:, y0:y1].copy()
+
+    def set_rows(self, y0, block):
+        """Overwrites the rows from y0 with `block`, as read from another field's get_rows."""
+        y1 = y0 + block.shape[1]
+        self.levels[:, y0:y1] = block
+        self.changed[:, y0:y1] = True
+
+    def pop_changed(self):
+        """Returns the (x, y) positions changed since the last call and resets tracking."""
+        changed = list(zip(*np.nonzero(self.changed)))
+        self.clear_changed()
+        return [(int(x), int(y)) for x, y in changed]
+
+    def clear_changed(self):
+        self.changed[:] = False
+
+
+class LazyPheromoneField:
+    """
+    Pheromone layer with decay applied when a cell is read.
+    Each cell keeps the level it was last written with and the tick of that
+    write; its current level is that value minus decay_rate per tick since,
+    clamped at zero. A tick only advances the clock, so untouched parts of the
+    map cost nothing. Same interface as PheromoneField, and the same levels up
+    to floating-point rounding (one multiply instead of repeated subtraction).
+    """
+    def __init__(self, width, height, decay_rate=0.03, max_level=100.0):
+        self.width = width
+        self.height = height
+        self.decay_rate = decay_rate
+        self.max_level = max_level
+        self.tick = 0
+        self.written = np.zeros((width, height), dtype=np.float64)
+        self.stamp = np.zeros((width, height), dtype=np.int64)
+        # Deposits since the last pop_changed(); decayed cells are derived from the window start
+        self.changed = np.zeros((width, height), dtype=bool)
+        self.window_start = 0
+
+    @property
+    def levels(self):
+        """Current levels of the whole field, materialized in one vectorized pass."""
+        return np.maximum(self.written - self.decay_rate * (self.tick - self.stamp), 0.0)
+
+    def level(self, pos):
+        """Current pheromone level at a grid position."""
+        x, y = pos
+        value = float(self.written[x, y]) - self.decay_rate * (self.tick - int(self.stamp[x, y]))
+        return value if value > 0 else 0.0
+
+    def levels_at(self, cells):
+        """Current levels at an array of flat cell indices (x * height + y), decayed on read."""
+        written = self.written.ravel()[cells]
+        stamp = self.stamp.ravel()[cells]
+        return np.maximum(written - self.decay_rate * (self.tick - stamp), 0.0)
+
+    def add(self, pos, amount):
+        """Deposits pheromone at a position, clamped to max_level."""
+        x, y = pos
+        self.written[x, y] = min(self.max_level, self.level(pos) + amount)
+        self.stamp[x, y] = self.tick
+        self.changed[x, y] = True
+
+    def decay(self):
+        """One tick passes; levels are brought up to date on read."""
+        self.tick += 1
+
+    def get_rows(self, y0, y1):
+        """Copy of the levels in rows y0..y1-1 (halo exchange, see core.sharding)."""
+        return np.maximum(self.written[:, y0:y1] - self.decay_rate * (self.tick - self.stamp[:, y0:y1]), 0.0)
+
+    def set_rows(self, y0, block):
+        """Overwrites the rows from y0 with `block`, as read from another field's get_rows."""
+        y1 = y0 + block.shape[1]
+        self.written[:, y0:y1] = block
+        self.stamp[:, y0:y1] = self.tick
+        self.changed[:, y0:y1] = True
+
+    def pop_changed(self):
+        """Returns the (x, y) positions changed since the last call and resets tracking."""
+        changed = self.changed
+        if self.tick > self.window_start:
+            # Anything still positive when the window opened has decayed since
+            at_start = self.written - self.decay_rate * (self.window_start - self.stamp)
+            changed = changed | (at_start > 0)
+        positions = [(int(x), int(y)) for x, y in zip(*np.nonzero(changed))]
+        self.clear_changed()
+        return positions
+
+    def clear_changed(self):
+        self.changed[:] = False
+        self.window_start = self.tick
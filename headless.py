@@ -0,0 +1,89 @@
+import argparse
+import ast
+import os
+from core.batch import parameter_grid, run_sweep
+from core.sharding import run_sharded
+from core.profiling import format_report
+
+
+def parse_param(text):
+    """Parses 'name=v1,v2,...' into (name, [values])."""
+    name, _, raw = text.partition("=")
+    if not raw:
+        raise argparse.ArgumentTypeError(f"expected name=value[,value...], got {text!r}")
+    values = []
+    for item in raw.split(","):
+        try:
+            values.append(ast.literal_eval(item))
+        except (ValueError, SyntaxError):
+            values.append(item)
+    return name, values
+
+
+if __name__ == "__main__":
+    # Run the Simulation without a window, e.g.
+    # python headless.py --steps 2000 --replicates 4 --param initial_workers=5,15 --param pheromone_decay_rate=0.01,0.03
+    parser = argparse.ArgumentParser(description="Run AntColonyModel headless over a parameter sweep.")
+    parser.add_argument("--steps", type=int, default=1000, help="ticks per run")
+    parser.add_argument("--replicates", type=int, default=1, help="runs per parameter combination")
+    parser.add_argument("--processes", type=int, default=None, help="pool size (default: all cores)")
+    parser.add_argument("--param", type=parse_param, action="append", default=[],
+                        help="model parameter to sweep, as name=v1,v2,... (repeatable)")
+    parser.add_argument("--seed", type=int, default=None, help="base seed; run i uses seed + i")
+    parser.add_argument("--out", default="results.csv", help="CSV file for the combined table")
+    parser.add_argument("--stream-dir", default=None,
+                        help="write each run to this directory as it goes instead of holding it in memory")
+    parser.add_argument("--sample-every", type=int, default=1, help="steps between streamed samples")
+    parser.add_argument("--agent-every", type=int, default=None, help="steps between streamed per-ant snapshots")
+    parser.add_argument("--checkpoint-dir", default=None,
+                        help="save each run here periodically and resume from it if present")
+    parser.add_argument("--checkpoint-every", type=int, default=1000, help="steps between checkpoints")
+    parser.add_argument("--profile", action="store_true", help="print time per behaviour and grid query counts")
+    parser.add_argument("--tiles", type=int, default=1,
+                        help="split one world into this many bands, one process each (no sweeps)")
+    parser.add_argument("--halo", type=int, default=4, help="ghost rows each tile keeps of its neighbours")
+    parser.add_argument("--nest", type=lambda text: tuple(int(v) for v in text.split(",")), action="append",
+                        default=None, help="nest center x,y for a tiled world (repeatable; default: near the map center)")
+    args = parser.parse_args()
+
+    parameters = {"width": 50, "height": 50}
+    parameters.update(dict(args.param))
+    try:
+        parameter_grid(parameters)   # rejects misspelt parameter names before any run starts
+    except ValueError as error:
+        parser.error(str(error))
+
+    if args.tiles > 1:
+        if any(len(v) > 1 for v in parameters.values() if isinstance(v, list)) or args.stream_dir \
+                or args.checkpoint_dir or args.profile:
+            parser.error("--tiles runs one world: no sweeps, streaming, checkpoints or profiling")
+        params = {name: v[0] if isinstance(v, list) else v for name, v in parameters.items()}
+        if args.seed is not None:
+            params["seed"] = args.seed
+        try:
+            results = run_sharded(params, args.steps, tiles=args.tiles, halo=args.halo, nests=args.nest,
+                                  processes=args.processes)
+        except ValueError as error:   # tile layout or nest placement
+            parser.error(str(error))
+        results.to_csv(args.out, index=False)
+        print(f"Wrote {len(results)} steps of a {args.tiles}-tile world to {args.out}")
+        raise SystemExit
+
+    stream = None
+    if args.stream_dir:
+        os.makedirs(args.stream_dir, exist_ok=True)
+        stream = {"directory": args.stream_dir, "interval": args.sample_every,
+                  "agent_interval": args.agent_every}
+
+    checkpoint = None
+    if args.checkpoint_dir:
+        os.makedirs(args.checkpoint_dir, exist_ok=True)
+        checkpoint = {"directory": args.checkpoint_dir, "every": args.checkpoint_every}
+
+    results = run_sweep(parameters, args.steps, replicates=args.replicates,
+                        processes=args.processes, seed=args.seed, stream=stream, checkpoint=checkpoint,
+                        profile=args.profile)
+    results.to_csv(args.out, index=False)
+    print(f"Wrote {len(results)} rows from {results['RunId'].nunique()} runs to {args.out}")
+    if args.profile:
+        print(format_report(results.attrs["profile"]))
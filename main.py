@@ -5,8 +5,17 @@ if __name__ == "__main__":
     # Control the 'resolution' of the grid (number of hexes in a column)
     # The renderer will calculate the number of columns to fill the screen width
     GRID_RESOLUTION = 60
+    # Draw pheromones as a single heatmap texture (False: tint each hex sprite)
+    PHEROMONE_HEATMAP = True
+    # "sync": STEPS_PER_FRAME model steps per frame (raise it to fast-forward)
+    # "thread": the model steps on a background thread at its own rate
+    STEPPING = "sync"
+    STEPS_PER_FRAME = 1
+    # Show per-behaviour timings and grid query counts under the HUD
+    PROFILE = False
     
     # Run the Simulation
     # No longer passing a full params dict, just the resolution
-    app = AntRenderer(1000, 1000, GRID_RESOLUTION)
+    app = AntRenderer(1000, 1000, GRID_RESOLUTION, pheromone_heatmap=PHEROMONE_HEATMAP,
+                      stepping=STEPPING, steps_per_frame=STEPS_PER_FRAME, profile=PROFILE)
     arcade.run()
@@ -0,0 +1,53 @@
+import numpy as np
+
+# Overlay colors (RGB) and maximum opacity
+PHEROMONE_RGB = (255, 255, 0)
+NEST_FILL_RGB = (0, 0, 0)
+MAX_PHEROMONE_ALPHA = 200
+MAX_NEST_FILL_ALPHA = 160
+
+
+def offset_columns(values):
+    """
+    Lays a (cols, rows) grid out as a (2 * rows + 1, cols) image matching the
+    renderer's offset hex layout: every cell covers two half-row pixels and odd
+    columns are shifted up by one half-row. Row 0 of the result is the top.
+    """
+    cols, rows = values.shape
+    out = np.zeros((2 * rows + 1, cols), dtype=values.dtype)
+    even, odd = values[0::2].T, values[1::2].T
+    out[0:2 * rows:2, 0::2] = even
+    out[1:2 * rows:2, 0::2] = even
+    out[1:2 * rows + 1:2, 1::2] = odd
+    out[2:2 * rows + 1:2, 1::2] = odd
+    return out[::-1]
+
+
+def build_heatmap(pheromone_levels, nest_fill=None):
+    """
+    Builds one RGBA image for the whole board.
+    - pheromone_levels: (cols, rows) array, drawn as a yellow overlay
+      using the same intensity curve as the per-sprite tint (level * 10, capped at 200).
+    - nest_fill: optional (cols, rows) array of nest storage fractions in [0, 1],
+      drawn as a darkening layer beneath the pheromones.
+    """
+    p_alpha = np.minimum(pheromone_levels * 10.0, MAX_PHEROMONE_ALPHA) / 255.0
+    p_alpha = offset_columns(p_alpha)
+
+    rgb = np.zeros(p_alpha.shape + (3,), dtype=np.float64)
+    alpha = np.zeros(p_alpha.shape, dtype=np.float64)
+
+    if nest_fill is not None:
+        n_alpha = offset_columns(nest_fill * (MAX_NEST_FILL_ALPHA / 255.0))
+        rgb[:] = NEST_FILL_RGB
+        alpha = n_alpha
+
+    # Standard "over" compositing of the pheromone layer onto the nest layer
+    out_alpha = p_alpha + alpha * (1.0 - p_alpha)
+    blend = np.divide(p_alpha, out_alpha, out=np.zeros_like(out_alpha), where=out_alpha > 0)
+    rgb = rgb * (1.0 - blend[..., None]) + np.asarray(PHEROMONE_RGB, dtype=np.float64) * blend[..., None]
+
+    image = np.empty(p_alpha.shape + (4,), dtype=np.uint8)
+    image[..., :3] = rgb.round().astype(np.uint8)
+    image[..., 3] = (out_alpha * 255.0).round().astype(np.uint8)
+    return image
@@ -1,13 +1,11 @@
 import arcade
 import math
-import mesa
+import numpy as np
 from PIL import Image, ImageDraw
 from core.model import AntColonyModel
-from core.agents.worker import WorkerAgent
-from core.agents.queen import QueenAgent
-from core.agents.drone import DroneAgent
-from core.agents.base_ant import BaseAnt
-from core.world.cell import FoodSource, NestCell, PheromoneCell
+from core.profiling import Profiler
+from rendering.heatmap import build_heatmap
+from rendering.stepping import SimulationRunner
 
 # Constants
 SCREEN_WIDTH = 1000
@@ -36,7 +34,8 @@ def make_hex_texture(radius, color):
 
 
 class AntRenderer(arcade.Window):
-    def __init__(self, width, height, grid_resolution):
+    def __init__(self, width, height, grid_resolution, pheromone_heatmap=True, show_nest_fill=True,
+                 stepping="sync", steps_per_frame=1, steps_per_second=None, profile=False):
         super().__init__(width, height, "Mesa 3.0+ Ant Sim")
         arcade.set_background_color(arcade.color.BLACK)
 
@@ -51,6 +50,16 @@ class AntRenderer(arcade.Window):
         model_params = {"width": cols, "height": rows, "initial_workers": 5}
         self.model = AntColonyModel(**model_params)
 
+        # The renderer only reads snapshots; the runner decides when the model steps
+        self.runner = SimulationRunner(self.model, mode=stepping, steps_per_frame=steps_per_frame,
+                                       steps_per_second=steps_per_second,
+                                       include_pheromones=not pheromone_heatmap)
+        self.snapshot = self.runner.latest()
+
+        # Optional hot-path timing, shown under the HUD
+        self.profiler = Profiler(self.model) if profile else None
+        if self.profiler: self.profiler.enable()
+
         actual_width = (1.5 * cols + 0.5) * self.hex_radius
         actual_height = (rows + 0.5) * self.vert_dist
         self.offset_x = (SCREEN_WIDTH - actual_width) / 2
@@ -77,7 +86,74 @@ class AntRenderer(arcade.Window):
                 self.grid_sprites.append(sprite)
                 self.sprite_map[(x, y)] = sprite
 
+        # 5. Pheromone Heatmap: one texture for the whole board instead of per-sprite tints
+        self.pheromone_heatmap = pheromone_heatmap
+        self.show_nest_fill = show_nest_fill
+        self.heatmap_layer = arcade.SpriteList()
+        if self.pheromone_heatmap:
+            self.heatmap_image = Image.new("RGBA", (cols, 2 * rows + 1), (0, 0, 0, 0))
+            self.heatmap_tex = arcade.Texture(self.heatmap_image, hash="pheromone-heatmap")
+            self.heatmap_sprite = arcade.Sprite(self.heatmap_tex)
+            self.heatmap_sprite.width = actual_width
+            self.heatmap_sprite.height = actual_height
+            self.heatmap_sprite.center_x = self.offset_x + actual_width / 2
+            self.heatmap_sprite.center_y = self.offset_y + actual_height / 2
+            self.heatmap_layer.append(self.heatmap_sprite)
+
+        # Paint everything once; afterwards only dirty cells are repainted
+        for pos in self.sprite_map:
+            self.paint_cell(pos)
+        if self.pheromone_heatmap:
+            self.update_heatmap()
+
         self.agent_map = {}
+        self.runner.start()
+
+    def paint_cell(self, pos):
+        """Sets texture and tint of one grid sprite from the current snapshot."""
+        x, y = pos
+        sprite = self.sprite_map[pos]
+
+        # 1. Determine Texture (Priority: Food > Nest > Empty)
+        food = pos in self.snapshot.food_cells
+        nest = self.model.nest_mask[x, y] # static, safe to read while the model steps
+
+        if food:
+            sprite.texture = self.food_tex
+        elif nest:
+            sprite.texture = self.nest_tex
+            # Storage fill is drawn by the heatmap layer (see update_heatmap)
+        else:
+            sprite.texture = self.empty_tex
+
+        # Heatmap mode draws pheromones from the field in one texture
+        if self.pheromone_heatmap: return
+
+        # 2. Determine Color (Pheromones only - Scent gradient removed)
+        r, g, b = 255, 255, 255
+
+        # LAYER: Pheromone Overlay (Yellow Tint)
+        max_phero = self.snapshot.pheromones[x, y]
+
+        if max_phero > 0:
+            p_intensity = min(200, int(max_phero * 10))
+            # Yellow = Red + Green (subtract Blue)
+            b -= p_intensity
+
+        # Ensure color values stay valid
+        sprite.color = (max(0, r), max(0, g), max(0, b))
+
+    def update_heatmap(self):
+        """Uploads the pheromone field (and nest storage fill) as the heatmap texture."""
+        nest_fill = None
+        if self.show_nest_fill:
+            nest_fill = np.zeros((self.model.width, self.model.height))
+            for (x, y), fill in self.snapshot.nest_fill.items():
+                nest_fill[x, y] = fill
+
+        pixels = build_heatmap(self.snapshot.pheromones, nest_fill)
+        self.heatmap_image.paste(Image.fromarray(pixels, "RGBA"))
+        self.ctx.default_atlas.update_texture_image(self.heatmap_tex)
 
     def get_pixel_pos(self, x, y):
         px = x * self.horiz_dist + self.hex_radius + self.offset_x
@@ -88,80 +164,59 @@ class AntRenderer(arcade.Window):
     def on_draw(self):
         self.clear()
         self.grid_sprites.draw()
+        self.heatmap_layer.draw()
         self.agent_sprites.draw()
 
         # Fixed Population Counter
-        ant_count = len([a for a in self.model.agents if isinstance(a, BaseAnt)])
-        # Use total_food_stockpile property instead of food_stockpile attribute
-        display_text = (f"Step: {self.model.steps}\n"
-                        f"Phase: {self.model.phase}\n"
-                        f"Active Ants: {ant_count}\n"
-                        f"Food Stockpile: {int(self.model.total_food_stockpile)}\n"
-                        f"Brood Count: {self.model.brood_count}")
+        snap = self.snapshot
+        display_text = (f"Step: {snap.steps}\n"
+                        f"Phase: {snap.phase}\n"
+                        f"Active Ants: {snap.ant_count}\n"
+                        f"Food Stockpile: {int(snap.food_stockpile)}\n"
+                        f"Brood Count: {snap.brood_count}")
         arcade.draw_text(display_text, 10, SCREEN_HEIGHT - 20, arcade.color.WHITE, 12, multiline=True, width=300)
+        if self.profiler:
+            arcade.draw_text(self.profiler.summary(top=8), 10, SCREEN_HEIGHT - 120, arcade.color.WHITE, 10,
+                             multiline=True, width=520, font_name="Courier New")
 
     def on_update(self, delta_time):
-        self.model.step()
-
-        # Update Grid Visuals
-        for (x, y), sprite in self.sprite_map.items():
-            cell_contents = self.model.grid.get_cell_list_contents([(x, y)])
-
-            # 1. Determine Texture (Priority: Food > Nest > Empty)
-            food = next((a for a in cell_contents if isinstance(a, FoodSource) and a.amount > 0), None)
-            nest = next((a for a in cell_contents if isinstance(a, NestCell)), None)
-
-            if food:
-                sprite.texture = self.food_tex
-            elif nest:
-                sprite.texture = self.nest_tex
-                # Optional: Visualize food storage in nest cells by darkening color?
-                # current_stored = nest.stored_food / nest.food_capacity
-            else:
-                sprite.texture = self.empty_tex
-
-            # 2. Determine Color (Pheromones only - Scent gradient removed)
-            r, g, b = 255, 255, 255
-
-            # LAYER: Pheromone Overlay (Yellow Tint)
-            max_phero = 0.0
-            for a in cell_contents:
-                if isinstance(a, PheromoneCell):
-                    if a.pheromone_level > max_phero:
-                        max_phero = a.pheromone_level
-
-            if max_phero > 0:
-                p_intensity = min(200, int(max_phero * 10))
-                # Yellow = Red + Green (subtract Blue)
-                b -= p_intensity
-
-            # Ensure color values stay valid
-            sprite.color = (max(0, r), max(0, g), max(0, b))
+        self.runner.advance()
+        previous_step = self.snapshot.steps
+        self.snapshot = self.runner.latest()
 
-        # Sync Agent Sprites
-        active_agents = set(self.model.agents)
-        for agent in active_agents:
-            if not isinstance(agent, (WorkerAgent, QueenAgent, DroneAgent)): continue
+        # Update Grid Visuals (only cells changed since the last snapshot)
+        for pos in self.snapshot.dirty_cells:
+            self.paint_cell(pos)
+        if self.pheromone_heatmap and self.snapshot.steps != previous_step:
+            self.update_heatmap()
 
-            if agent not in self.agent_map:
+        # Sync Agent Sprites
+        ants = self.snapshot.ants
+        for agent_id, (caste, pos) in ants.items():
+            if agent_id not in self.agent_map:
                 tex = self.worker_tex
-                if isinstance(agent, QueenAgent):
+                if caste == "QUEEN":
                     tex = self.queen_tex
-                elif isinstance(agent, DroneAgent):
+                elif caste == "DRONE":
                     tex = self.drone_tex
                 sprite = arcade.Sprite(tex)
-                if agent.pos: sprite.center_x, sprite.center_y = self.get_pixel_pos(agent.pos[0], agent.pos[1])
-                self.agent_map[agent] = sprite
+                if pos: sprite.center_x, sprite.center_y = self.get_pixel_pos(pos[0], pos[1])
+                self.agent_map[agent_id] = sprite
                 self.agent_sprites.append(sprite)
 
-            sprite = self.agent_map[agent]
-            if agent.pos:
-                tx, ty = self.get_pixel_pos(agent.pos[0], agent.pos[1])
+            sprite = self.agent_map[agent_id]
+            if pos:
+                tx, ty = self.get_pixel_pos(pos[0], pos[1])
                 sprite.center_x = arcade.math.lerp(sprite.center_x, tx, 0.2)
                 sprite.center_y = arcade.math.lerp(sprite.center_y, ty, 0.2)
 
         mapped_agents = list(self.agent_map.keys())
-        for agent in mapped_agents:
-            if agent not in active_agents:
-                sprite = self.agent_map.pop(agent)
+        for agent_id in mapped_agents:
+            if agent_id not in ants:
+                sprite = self.agent_map.pop(agent_id)
                 sprite.remove_from_sprite_lists()
+
+    def on_close(self):
+        self.runner.stop()
+        if self.profiler: self.profiler.disable()
+        super().on_close()
@@ -0,0 +1,95 @@
+import threading
+import time
+
+from core.snapshot import ModelSnapshot
+
+
+class SimulationRunner:
+    """
+    Steps an AntColonyModel independently of the arcade frame loop.
+
+    mode="sync":   advance() runs `steps_per_frame` steps on the caller's thread
+                   (fast-forward when > 1).
+    mode="thread": a daemon thread steps the model continuously, capped at
+                   `steps_per_second` if given. A snapshot is captured on the
+                   first step after the renderer took the previous one, so the
+                   view trails the simulation by at most one frame.
+
+    Either way the renderer only reads ModelSnapshots. Dirty cells from every
+    step are accumulated so none are lost when several steps pass per frame.
+    """
+    def __init__(self, model, mode="sync", steps_per_frame=1, steps_per_second=None, include_pheromones=True):
+        if mode not in ("sync", "thread"):
+            raise ValueError(f"Unknown stepping mode: {mode}")
+        self.model = model
+        self.mode = mode
+        self.steps_per_frame = steps_per_frame
+        self.steps_per_second = steps_per_second
+        self.include_pheromones = include_pheromones
+
+        self._lock = threading.Lock()
+        self._pending_dirty = set()
+        self._fresh = None  # newest snapshot not yet handed to the renderer
+        self._last = ModelSnapshot.capture(model, self._pop_dirty())
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _pop_dirty(self):
+        return self.model.pop_dirty_cells(include_pheromones=self.include_pheromones)
+
+    def _step_once(self):
+        self.model.step()
+        dirty = self._pop_dirty()
+        with self._lock:
+            self._pending_dirty |= dirty
+            # Only capture when the renderer has taken the previous snapshot
+            if self._fresh is None:
+                self._publish()
+
+    def _publish(self):
+        """Captures the current model state; caller holds the lock."""
+        self._fresh = ModelSnapshot.capture(self.model, self._pending_dirty)
+        self._pending_dirty = set()
+
+    def _run(self):
+        interval = 1.0 / self.steps_per_second if self.steps_per_second else 0.0
+        while not self._stop.is_set():
+            started = time.perf_counter()
+            self._step_once()
+            remaining = interval - (time.perf_counter() - started)
+            if remaining > 0:
+                self._stop.wait(remaining)
+            else:
+                time.sleep(0) # let the render thread take the GIL
+
+    def start(self):
+        if self.mode == "thread" and self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="ant-sim", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def advance(self):
+        """Sync mode: run this frame's steps. Thread mode: nothing to do."""
+        if self.mode == "sync":
+            for _ in range(self.steps_per_frame):
+                self.model.step()
+                self._pending_dirty |= self._pop_dirty()
+            with self._lock:
+                self._publish()
+
+    def latest(self):
+        """
+        Returns the newest snapshot. Its dirty_cells are only non-empty the first
+        time it is returned; an unchanged snapshot has nothing to repaint.
+        """
+        with self._lock:
+            if self._fresh is not None:
+                self._last, self._fresh = self._fresh, None
+                return self._last
+        self._last.dirty_cells = set()
+        return self._last
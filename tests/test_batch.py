@@ -0,0 +1,54 @@
+import os
+import subprocess
+import sys
+
+import pandas as pd
+import pytest
+
+from core.batch import parameter_grid, run_sweep
+
+
+def test_parameter_grid_sweeps_lists_only():
+    grid = parameter_grid({"width": 30, "initial_workers": [5, 10], "pheromone_decay_rate": (0.01, 0.05)})
+    assert len(grid) == 4
+    assert all(params["width"] == 30 for params in grid)
+    assert {(p["initial_workers"], p["pheromone_decay_rate"]) for p in grid} == {
+        (5, 0.01), (5, 0.05), (10, 0.01), (10, 0.05)}
+
+
+def test_sweep_expands_grid_and_replicates():
+    parameters = {"width": 30, "height": 30, "initial_workers": [5, 10]}
+    df = run_sweep(parameters, 50, replicates=2, processes=1)
+    assert df["RunId"].nunique() == 4
+    assert set(df["initial_workers"]) == {5, 10}
+    assert list(df[df["RunId"] == 0]["Step"]) == list(range(1, 51))
+
+
+def test_seeded_sweep_replays():
+    parameters = {"width": 30, "height": 30, "initial_workers": [5, 10]}
+    a = run_sweep(parameters, 50, replicates=2, processes=1, seed=21)
+    b = run_sweep(parameters, 50, replicates=2, processes=1, seed=21)
+    assert a.equals(b)
+
+
+def test_streamed_run_writes_sampled_rows(tmp_path):
+    stream = {"directory": str(tmp_path), "interval": 10}
+    df = run_sweep({"width": 30, "height": 30}, 100, processes=1, seed=22, stream=stream)
+    path = df["Path"].iloc[0]
+    table = pd.read_parquet(path) if path.endswith(".parquet") else pd.read_csv(path)
+    assert list(table["Step"]) == list(range(10, 101, 10))
+
+
+def test_headless_imports_skip_rendering():
+    code = ("import sys, core.batch, core.recorder, core.checkpoint; "
+            "print(sorted({'arcade', 'pyglet', 'PIL'} & set(sys.modules)))")
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    result = subprocess.run([sys.executable, "-c", code], cwd=root, check=True, capture_output=True, text=True)
+    assert result.stdout.strip() == "[]"
+
+
+def test_unknown_parameters_are_rejected():
+    with pytest.raises(ValueError, match="initial_worker"):
+        parameter_grid({"width": 30, "initial_worker": [5, 10]})
+    with pytest.raises(ValueError, match="decay_rate"):
+        run_sweep({"decay_rate": 0.1}, 10, processes=1)
@@ -0,0 +1,17 @@
+from benchmarks.step_time import compare, parse_size, run_benchmarks
+
+
+def test_small_benchmark_reports_every_case():
+    results = run_benchmarks(sizes=[(20, 20)], workers=[3, 5], steps=5, log=lambda line: None)
+    assert [(c["width"], c["height"], c["workers"]) for c in results["cases"]] == [(20, 20, 3), (20, 20, 5)]
+    assert all(c["step_ms_median"] > 0 and c["peak_memory_kb"] > 0 for c in results["cases"])
+
+
+def test_compare_flags_slowdowns_past_threshold():
+    def case(workers, ms):
+        return {"width": 20, "height": 20, "workers": workers, "step_ms_median": ms}
+    baseline = {"cases": [case(5, 1.0), case(10, 2.0)]}
+    results = {"cases": [case(5, 1.05), case(10, 2.5), case(20, 9.0)]}
+    rows = compare(results, baseline, threshold=0.10)
+    assert [(key[2], regressed) for key, _, _, _, regressed in rows] == [(5, False), (10, True)]
+    assert parse_size("30x20") == (30, 20) and parse_size("40") == (40, 40)
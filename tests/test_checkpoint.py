@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+
+from core.batch import run_model
+from core.model import AntColonyModel
+from core.profiling import Profiler, STEP_LABEL
+
+
+def _run(model, steps):
+    for _ in range(steps):
+        model.step()
+    return model
+
+
+def _state(model):
+    ants = sorted((a.unique_id, a.pos, a.state, float(a.energy)) for a in model.agents if hasattr(a, "energy"))
+    return model.datacollector.get_model_vars_dataframe(), ants, model.pheromones.levels.copy()
+
+
+@pytest.mark.parametrize("params", [{}, {"physiology_engine": True, "lazy_pheromones": True, "batched_movement": True}])
+def test_resumed_run_matches_uninterrupted_run(tmp_path, params):
+    path = str(tmp_path / "run.ckpt")
+    _run(AntColonyModel(seed=20, **params), 150).save_checkpoint(path)
+    resumed = _run(AntColonyModel.load_checkpoint(path), 150)
+    straight = _run(AntColonyModel(seed=20, **params), 300)
+    (df_a, ants_a, levels_a), (df_b, ants_b, levels_b) = _state(resumed), _state(straight)
+    assert df_a.equals(df_b)
+    assert ants_a == ants_b
+    assert np.array_equal(levels_a, levels_b)
+
+
+def test_run_model_resumes_from_its_checkpoint(tmp_path):
+    checkpoint = {"directory": str(tmp_path), "every": 10}
+    run_model({"seed": 6}, 30, checkpoint=checkpoint)
+    assert AntColonyModel.load_checkpoint(str(tmp_path / "run_0.ckpt")).steps == 30
+    resumed = run_model({"seed": 6}, 40, checkpoint=checkpoint)
+    straight = run_model({"seed": 6}, 40)
+    assert resumed.equals(straight)
+
+
+def test_checkpoint_while_profiling(tmp_path):
+    model = AntColonyModel(seed=5)
+    path = str(tmp_path / "run.ckpt")
+    with Profiler(model):
+        for _ in range(20):
+            model.step()
+        model.save_checkpoint(path)
+    restored = AntColonyModel.load_checkpoint(path)
+    restored.step()
+    assert restored.steps == 21
+
+
+def test_run_model_with_profile_and_checkpoint(tmp_path):
+    checkpoint = {"directory": str(tmp_path), "every": 10}
+    df = run_model({"seed": 6}, 30, checkpoint=checkpoint, profile=True)
+    assert df.attrs["profile"][STEP_LABEL]["calls"] == 30
+    assert (tmp_path / "run_0.ckpt").exists()
@@ -0,0 +1,59 @@
+import numpy as np
+
+from core.agents.brood import BroodAgent
+from core.agents.worker import WorkerAgent
+from core.model import AntColonyModel
+from core.tasks import TASKS
+
+
+def test_same_seed_replays_exactly():
+    a, b = AntColonyModel(seed=16), AntColonyModel(seed=16)
+    for _ in range(300):
+        a.step()
+        b.step()
+    assert a.datacollector.get_model_vars_dataframe().equals(b.datacollector.get_model_vars_dataframe())
+    assert sorted((x.unique_id, x.pos) for x in a.agents) == sorted((x.unique_id, x.pos) for x in b.agents)
+
+
+def test_physiology_engine_survives_old_age():
+    model = AntColonyModel(seed=1, physiology_engine=True)
+    for _ in range(5200):
+        model.step()
+    ants = [a for a in model.agents if getattr(a, "caste", None) is WorkerAgent]
+    assert model.ant_counts[WorkerAgent] == len(ants)
+    assert all(a.age < a.max_age for a in ants)
+
+
+def test_brood_develops_on_schedule():
+    model = AntColonyModel(seed=17)
+    egg = model.brood_schedule.lay_egg(model.nest_center)
+    laid = model.steps
+    while model.steps < laid + egg.egg_to_larva_time:
+        assert egg.stage == "EGG"
+        model.step()
+    assert egg.stage == "LARVA"
+    egg.feed(egg.larva_to_pupa_food_needed)
+    assert egg.stage == "PUPA"
+    assert model.brood_counts["PUPA"] == sum(1 for b in model.agents if isinstance(b, BroodAgent) and b.stage == "PUPA")
+
+
+def test_sleeping_agents_are_skipped_until_their_alarm():
+    model = AntColonyModel(seed=18)
+    ant = next(a for a in model.agents if getattr(a, "caste", None) is WorkerAgent)
+    model.scheduler.sleep(ant, model.steps + 5)
+    age = ant.age
+    for _ in range(4):
+        model.step()
+    assert ant.age == age and model.scheduler.is_sleeping(ant)
+    model.step()
+    assert ant.age == age + 1 and not model.scheduler.is_sleeping(ant)
+
+
+def test_task_draws_follow_weights():
+    model = AntColonyModel(seed=19)
+    model.tasks.refresh()
+    weights = np.array(model.tasks.weights)
+    draws = [model.tasks.draw() for _ in range(30000)]
+    observed = np.array([draws.count(task) for task in TASKS]) / len(draws)
+    assert np.allclose(observed, weights / weights.sum(), atol=0.01)
+    assert "IDLE" not in {model.tasks.draw(leave_idle=True) for _ in range(2000)}
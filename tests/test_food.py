@@ -0,0 +1,53 @@
+import random
+
+import numpy as np
+
+from core.model import AntColonyModel
+from core.world.food import FoodLayer
+from core.world.food_index import FoodIndex
+from core.world.hex_grid import HexGrid, hex_distance
+
+
+def test_food_index_nearest_matches_brute_force():
+    rng = random.Random(1)
+    index = FoodIndex(hex_distance)
+    food = {(rng.randrange(30), rng.randrange(30)) for _ in range(40)}
+    for pos in food:
+        index.add(pos)
+    for _ in range(200):
+        pos = (rng.randrange(30), rng.randrange(30))
+        in_range = [(hex_distance(pos, f), f) for f in food if f != pos and hex_distance(pos, f) <= 4]
+        assert index.nearest(pos, 4) == (min(in_range)[1] if in_range else None)
+
+
+def test_discard_empties_buckets():
+    index = FoodIndex(hex_distance)
+    index.add((5, 5))
+    index.discard((5, 5))
+    index.discard((5, 5))
+    assert len(index) == 0 and not index.buckets
+    assert index.nearest((6, 6), 3) is None
+
+
+def test_food_layer_keeps_index_in_step_and_off_blocked_cells():
+    grid = HexGrid(20, 20)
+    layer = FoodLayer(20, 20, grid.distance, grid.neighbor_index, regrowth_chance=0.5, expansion_chance=0.5)
+    blocked = np.zeros((20, 20), dtype=bool)
+    blocked[8:12, 8:12] = True
+    for pos in ((9, 7), (12, 10), (3, 3)):
+        layer.add(pos, 120)
+    rng = np.random.default_rng(2)
+    for _ in range(200):
+        layer.step(rng, blocked)
+    assert not (layer.amount[blocked] > 0).any()
+    assert layer.index.cells == {tuple(int(v) for v in p) for p in zip(*np.nonzero(layer.amount))}
+    assert layer.harvest((3, 3), 1000) > 0
+    assert (3, 3) not in layer.index
+
+
+def test_model_food_stays_off_the_nest():
+    model = AntColonyModel(seed=15)
+    for _ in range(1000):
+        model.step()
+    assert not (model.food.amount[model.nest_mask] > 0).any()
+    assert model.food.index.cells == {tuple(int(v) for v in p) for p in zip(*np.nonzero(model.food.amount))}
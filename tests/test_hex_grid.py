@@ -0,0 +1,22 @@
+from core.world.hex_grid import HexGrid, hex_distance
+
+
+def test_hex_adjacency_matches_distance():
+    grid = HexGrid(9, 7)
+    cells = [(x, y) for x in range(9) for y in range(7)]
+    for pos in cells:
+        expected = {c for c in cells if hex_distance(pos, c) == 1}
+        assert set(grid.neighbors(pos)) == expected
+        assert set(grid.get_neighborhood(pos)) == expected
+        row = grid.neighbor_index[pos[0] * 7 + pos[1]]
+        assert {divmod(int(i), 7) for i in row if i >= 0} == expected
+        assert set(grid.disc(pos, 2)) == {c for c in cells if 0 < hex_distance(pos, c) <= 2}
+
+
+def test_hex_distance_is_symmetric_and_triangular():
+    cells = [(x, y) for x in range(6) for y in range(6)]
+    for a in cells:
+        assert hex_distance(a, a) == 0
+        for b in cells:
+            assert hex_distance(a, b) == hex_distance(b, a)
+            assert hex_distance(a, b) <= hex_distance(a, (3, 3)) + hex_distance((3, 3), b)
@@ -0,0 +1,74 @@
+import numpy as np
+
+from core.agents.base_ant import BaseAnt
+from core.agents.brood import BroodAgent
+from core.agents.drone import DroneAgent
+from core.agents.worker import WorkerAgent
+from core.model import AntColonyModel
+
+
+def test_counters_match_agents():
+    model = AntColonyModel()
+    for _ in range(300):
+        model.step()
+    ants = [a for a in model.agents if isinstance(a, BaseAnt)]
+    brood = [a for a in model.agents if isinstance(a, BroodAgent)]
+    assert model.ant_count == len(ants)
+    assert model.ant_counts[WorkerAgent] == sum(isinstance(a, WorkerAgent) for a in ants)
+    assert model.brood_count == len(brood)
+    for stage, count in model.brood_counts.items():
+        assert count == sum(b.stage == stage for b in brood)
+
+
+def test_homing_field_leads_every_cell_into_the_nest():
+    model = AntColonyModel()
+    for x in range(model.width):
+        for y in range(model.height):
+            pos = (x, y)
+            for _ in range(model.width + model.height):
+                if model.nest_mask[pos]: break
+                pos = model.homing_field[pos]
+            assert model.nest_mask[pos]
+
+
+def test_dirty_cells_cover_pheromone_changes_and_reset():
+    model = AntColonyModel(seed=8)
+    for _ in range(50):
+        model.step()
+    model.pop_dirty_cells()
+    for _ in range(20):
+        before = model.pheromones.levels.copy()
+        model.step()
+        dirty = model.pop_dirty_cells()
+        changed = {(int(x), int(y)) for x, y in zip(*np.nonzero(before != model.pheromones.levels))}
+        assert changed <= dirty
+        assert not model.pop_dirty_cells()
+
+
+def test_long_run_survives_old_age():
+    # Workers reach max_age at step 5000; dead ants must stop acting that tick
+    model = AntColonyModel(seed=1)
+    for _ in range(6000):
+        model.step()
+    assert model.steps == 6000
+
+
+def test_drone_dying_of_old_age_stops_acting():
+    model = AntColonyModel(seed=2)
+    drone = DroneAgent(model)
+    model.grid.place_agent(drone, (3, 3))
+    drone.age = drone.max_age - 1
+    drone.step()
+    assert drone.pos is None
+    assert drone not in model.grid.ants_at((3, 3))
+
+
+def test_grid_slots_match_cell_contents():
+    model = AntColonyModel(seed=3)
+    for _ in range(300):
+        model.step()
+    for pos, ants in model.grid.ants.items():
+        on_cell = {a for a in model.grid.get_cell_list_contents([pos]) if isinstance(a, BaseAnt)}
+        assert ants == on_cell
+    assert sum(len(a) for a in model.grid.ants.values()) == model.ant_count
+    assert set(model.grid.env) == {tuple(p) for p in zip(*model.nest_mask.nonzero())}
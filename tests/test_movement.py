@@ -0,0 +1,52 @@
+import numpy as np
+
+from core.model import AntColonyModel
+from core.agents.worker import WorkerAgent
+
+
+def foragers(model):
+    return [a for a in model.agents if getattr(a, "caste", None) is WorkerAgent and a.state == "FORAGING"]
+
+
+def test_every_forager_gets_a_neighbouring_move():
+    model = AntColonyModel(seed=8, batched_movement=True)
+    workers = [a for a in model.agents if getattr(a, "caste", None) is WorkerAgent]
+    for i, ant in enumerate(workers):
+        ant.state = "FORAGING"
+        model.grid.move_agent(ant, (i, 0 if i % 2 else model.height - 1))
+    model.movement.refresh()
+    ants = foragers(model)
+    assert len(ants) == len(workers)
+    for ant in ants:
+        assert model.movement.next_pos(ant) in model.grid.neighbors(ant.pos)
+
+
+def test_move_distribution_follows_pheromone_weights():
+    model = AntColonyModel(seed=9, batched_movement=True)
+    ant = next(a for a in model.agents if getattr(a, "caste", None) is WorkerAgent)
+    model.grid.move_agent(ant, (5, 5))
+    ant.state = "FORAGING"
+    neighbors = model.grid.neighbors(ant.pos)
+    model.pheromones.add(neighbors[0], 20.0)
+
+    levels = np.array([model.pheromones.level(n) + 0.1 for n in neighbors])
+    expected = ant.exploration_rate / len(neighbors) + (1 - ant.exploration_rate) * levels / levels.sum()
+
+    counts = dict.fromkeys(neighbors, 0)
+    draws = 20000
+    for _ in range(draws):
+        model.movement.refresh()
+        counts[model.movement.next_pos(ant)] += 1
+    observed = np.array([counts[n] for n in neighbors]) / draws
+    assert np.allclose(observed, expected, atol=0.015)
+
+
+def test_lazy_levels_at_matches_eager():
+    eager = AntColonyModel(seed=10, batched_movement=True)
+    lazy = AntColonyModel(seed=10, batched_movement=True, lazy_pheromones=True)
+    for _ in range(200):
+        eager.step()
+        lazy.step()
+    cells = np.arange(eager.width * eager.height)
+    assert np.allclose(eager.pheromones.levels_at(cells), lazy.pheromones.levels_at(cells))
+    assert eager.ant_count == lazy.ant_count
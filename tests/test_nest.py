@@ -0,0 +1,43 @@
+import pytest
+
+from core.model import AntColonyModel
+from core.world.hex_grid import hex_distance
+from core.world.nest import NestLedger
+
+POSITIONS = [(x, y) for x in range(3) for y in range(3)]
+
+
+def test_deposit_fills_nearest_slots_first():
+    ledger = NestLedger(POSITIONS, hex_distance, capacity=10.0)
+    assert ledger.deposit((0, 0), 15.0) == 15.0
+    assert ledger.stored_at((0, 0)) == 10.0
+    assert sum(ledger.stored_at(p) for p in POSITIONS) == ledger.total == 15.0
+    assert ledger.deposit((1, 1), 1000.0) == 75.0
+    assert ledger.total == ledger.total_capacity
+
+
+def test_withdraw_takes_nearest_stock_and_never_overdraws():
+    ledger = NestLedger(POSITIONS, hex_distance, capacity=10.0)
+    ledger.deposit((2, 2), 5.0)
+    assert ledger.withdraw((0, 0), 3.0) == 3.0
+    assert ledger.stored_at((2, 2)) == 2.0
+    assert ledger.withdraw((0, 0), 10.0) == 2.0
+    assert ledger.withdraw((0, 0), 1.0) == 0.0
+    assert ledger.total == pytest.approx(0.0)
+
+
+def test_model_stockpile_matches_the_slots():
+    model = AntColonyModel(seed=24)
+    for _ in range(500):
+        model.step()
+    assert model.total_food_stockpile == pytest.approx(sum(model.nest.stored))
+    assert (model.nest.stored >= 0).all() and (model.nest.stored <= model.nest.capacity).all()
+
+
+def test_off_nest_lookups_share_the_center_order():
+    ledger = NestLedger(POSITIONS, hex_distance, center=(1, 1))
+    for x in range(20, 60):
+        assert ledger.order((x, x)) is ledger.orders[(1, 1)]
+    ledger.deposit((30, 30), 5.0)
+    assert ledger.stored_at((1, 1)) == 5.0
+    assert set(ledger.orders) == set(POSITIONS)
@@ -0,0 +1,57 @@
+import numpy as np
+
+from core.model import AntColonyModel
+from core.agents.worker import WorkerAgent
+from core.world.pheromone import PheromoneField, LazyPheromoneField
+
+
+def test_decay_and_clamp():
+    field = PheromoneField(4, 4, decay_rate=0.5, max_level=10.0)
+    field.add((1, 1), 25.0)
+    assert field.level((1, 1)) == 10.0
+    field.decay()
+    assert field.level((1, 1)) == 9.5
+    for _ in range(30):
+        field.decay()
+    assert field.level((1, 1)) == 0.0
+    assert (field.levels >= 0).all()
+
+
+def test_model_keeps_levels_in_range():
+    model = AntColonyModel()
+    for _ in range(300):
+        model.step()
+    levels = model.pheromones.levels
+    assert levels.shape == (model.width, model.height)
+    assert levels.min() >= 0.0 and levels.max() <= model.pheromones.max_level
+
+
+def test_returning_worker_lays_into_the_field():
+    model = AntColonyModel()
+    worker = next(a for a in model.agents if isinstance(a, WorkerAgent))
+    worker.lay_pheromone()
+    assert model.pheromones.level(worker.pos) == worker.max_pheromone
+
+
+def test_lazy_field_matches_eager_field():
+    rng = np.random.default_rng(0)
+    eager, lazy = PheromoneField(8, 8), LazyPheromoneField(8, 8)
+    for _ in range(300):
+        for field in (eager, lazy):
+            field.decay()
+        for _ in range(3):
+            pos = tuple(int(v) for v in rng.integers(0, 8, 2))
+            eager.add(pos, 5.0)
+            lazy.add(pos, 5.0)
+        assert sorted(eager.pop_changed()) == sorted(lazy.pop_changed())
+    assert np.allclose(eager.levels, lazy.levels)
+
+
+def test_lazy_and_eager_models_follow_the_same_trajectory():
+    eager = AntColonyModel(seed=14)
+    lazy = AntColonyModel(seed=14, lazy_pheromones=True)
+    for _ in range(400):
+        eager.step()
+        lazy.step()
+    assert eager.datacollector.get_model_vars_dataframe().equals(lazy.datacollector.get_model_vars_dataframe())
+    assert np.allclose(eager.pheromones.levels, lazy.pheromones.levels)
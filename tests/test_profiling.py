@@ -0,0 +1,26 @@
+from core.agents.worker import WorkerAgent
+from core.model import AntColonyModel
+from core.profiling import Profiler, STEP_LABEL
+
+
+def test_hooks_count_calls():
+    model = AntColonyModel(seed=7)
+    with Profiler(model) as profiler:
+        for _ in range(200):
+            model.step()
+    report = profiler.report()
+    assert report[STEP_LABEL]["calls"] == 200
+    assert report["Pheromones.decay"]["calls"] == 200
+    for label in ("WorkerAgent.step", "DataCollector.collect", "food_index.nearest",
+                  "grid.neighbors", "nest.is_at_nest", "nest.withdraw"):
+        assert report[label]["calls"] > 0, label
+
+
+def test_disable_restores_methods():
+    model = AntColonyModel(seed=7)
+    step, worker_step = model.step, WorkerAgent.step
+    profiler = Profiler(model)
+    profiler.enable()
+    assert WorkerAgent.step is not worker_step
+    profiler.disable()
+    assert model.step == step and WorkerAgent.step is worker_step
@@ -0,0 +1,75 @@
+import numpy as np
+
+from core.model import AntColonyModel
+from rendering.heatmap import build_heatmap, offset_columns
+from rendering.stepping import SimulationRunner
+
+
+def test_offset_columns_layout_and_parity():
+    cols, rows = 5, 4
+    values = np.arange(1, cols * rows + 1).reshape(cols, rows)
+    image = offset_columns(values)
+    assert image.shape == (2 * rows + 1, cols)
+    bottom_up = image[::-1]
+    for x in range(cols):
+        shift = x % 2  # odd columns sit half a row higher
+        for y in range(rows):
+            assert bottom_up[2 * y + shift, x] == values[x, y]
+            assert bottom_up[2 * y + 1 + shift, x] == values[x, y]
+        assert bottom_up[0 if shift else 2 * rows, x] == 0
+    assert all((image == v).sum() == 2 for v in values.flat)
+
+
+def test_heatmap_is_transparent_without_pheromone_or_nest():
+    levels = np.zeros((6, 4))
+    levels[2, 1] = 50.0
+    image = build_heatmap(levels)
+    assert image.shape == (9, 6, 4)
+    assert (image[..., 3] > 0).sum() == 2
+
+
+def recording_runner(seed, **kwargs):
+    """A SimulationRunner whose model logs the dirty cells of every step."""
+    model = AntColonyModel(seed=seed)
+    model.pheromones.add(model.nest_center, 10.0)  # decays over the next steps
+    runner = SimulationRunner(model, **kwargs)
+    log = []
+    pop = model.pop_dirty_cells
+    def logged_pop(**pop_kwargs):
+        dirty = pop(**pop_kwargs)
+        log.append(set(dirty))
+        return dirty
+    model.pop_dirty_cells = logged_pop
+    return runner, log
+
+
+def test_fast_forward_keeps_dirty_cells_of_every_step():
+    runner, log = recording_runner(10, steps_per_frame=3)
+    start = runner.model.steps
+    runner.advance()
+    snapshot = runner.latest()
+    assert snapshot.steps == start + 3 and len(log) == 3
+    assert snapshot.dirty_cells == set().union(*log)
+    assert snapshot.dirty_cells
+
+
+def test_latest_hands_out_each_snapshot_once():
+    runner, _ = recording_runner(11)
+    runner.advance()
+    snapshot = runner.latest()
+    assert snapshot.dirty_cells
+    again = runner.latest()
+    assert again is snapshot and again.dirty_cells == set()
+
+
+def test_thread_mode_only_publishes_when_the_last_snapshot_was_taken():
+    runner, log = recording_runner(12, mode="thread")
+    start = runner.model.steps
+    runner._step_once()
+    runner._step_once()  # renderer has not taken the first snapshot yet
+    first = runner.latest()
+    assert first.steps == start + 1 and first.dirty_cells == log[0]
+    runner._step_once()
+    second = runner.latest()
+    assert second.steps == start + 3
+    assert second.dirty_cells == log[1] | log[2]
@@ -0,0 +1,129 @@
+import os
+import subprocess
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from core import sharding
+from core.model import AntColonyModel
+from core.sharding import ShardedWorld
+from core.world.food import FoodLayer
+
+
+def test_serial_and_multiprocess_runs_match():
+    kwargs = dict(width=40, height=40, tiles=2, seed=11, nests=[(20, 10)])
+    with ShardedWorld(processes=1, **kwargs) as world:
+        world.run(150)
+        serial, serial_fields = world.results(), world.fields()
+    with ShardedWorld(**kwargs) as world:
+        world.run(150)
+        parallel, parallel_fields = world.results(), world.fields()
+    assert serial.equals(parallel)
+    for a, b in zip(serial_fields, parallel_fields):
+        assert np.array_equal(a, b)
+
+
+def test_nest_across_tiles_is_rejected():
+    with pytest.raises(ValueError):
+        ShardedWorld(width=50, height=50, tiles=2, nests=[(25, 25)], processes=1)
+
+
+def test_food_is_conserved_across_tiles(monkeypatch):
+    # No seeding, regrowth or spreading: food only leaves the map through harvests
+    monkeypatch.setattr(sharding, "INITIAL_FOOD_SEEDS", 0)
+    monkeypatch.setattr(sharding, "FOOD_SEED_CHANCE", 0.0)
+    gathered = []
+    harvest = FoodLayer.harvest
+    monkeypatch.setattr(FoodLayer, "harvest", lambda self, pos, amount: gathered.append(harvest(self, pos, amount)) or gathered[-1])
+
+    world = ShardedWorld(width=50, height=50, tiles=2, seed=12, nests=[(25, 12)], processes=1, initial_workers=40)
+    tiles = world.hosts[0][0].tiles
+    for tile in tiles.values():
+        tile.food.regrowth_chance = tile.food.expansion_chance = 0.0
+    # Patches on both sides of the border at row 25, inside scent range of each other
+    seeds = [((x, y), 10) for x in range(0, 50, 2) for y in (23, 24, 25, 26)]
+    for pos, amount in seeds:
+        world.inboxes[world.owner(pos[1])].setdefault("seeds", []).append((pos, amount))
+    world.run(800)
+
+    placed = sum(amount for _, amount in seeds)
+    remaining = world.fields()[1].sum()
+    unapplied = -sum(delta for inbox in world.inboxes for _, delta in inbox.get("food", ()))
+    assert sum(gathered) > 0
+    assert placed - remaining == pytest.approx(sum(gathered) - world.food_overdrawn - unapplied)
+    assert world.food_overdrawn <= 0.05 * sum(gathered)
+
+
+def test_ghost_harvest_is_not_offered_twice(monkeypatch):
+    monkeypatch.setattr(sharding, "INITIAL_FOOD_SEEDS", 0)
+    monkeypatch.setattr(sharding, "FOOD_SEED_CHANCE", 0.0)
+    world = ShardedWorld(width=40, height=40, tiles=2, seed=13, nests=[(20, 8)], processes=1)
+    upper = world.hosts[0][0].tiles[0]   # owns rows 0..19; row 20 is its first ghost row
+    world.inboxes[1]["seeds"] = [((10, 20), 5)]
+    world.run(2)   # the patch reaches the upper tile's ghost row
+
+    def forager_at(pos):
+        ant = next(a for a in upper.agents if getattr(a, "state", None) in ("IDLE", "NURSING"))
+        upper.grid.move_agent(ant, pos)
+        ant.state, ant.inventory, ant.energy = "FORAGING", 0.0, ant.max_energy
+        return ant
+
+    first = forager_at((10, 19))
+    world.step()
+    assert first.inventory == 5   # took the whole patch from the ghost copy
+    second = forager_at((10, 19))
+    world.step()
+    assert second.inventory == 0  # the owner's stale edge row must not offer it again
+    world.step()
+    assert world.fields()[1][10, 20] == 0
+    assert world.food_overdrawn == 0
+
+
+def test_food_stays_off_a_neighbours_nest_in_ghost_rows(monkeypatch):
+    # The nest's top rows (20, 21) are ghost rows of the upper tile, right next to the patch
+    monkeypatch.setattr(sharding, "INITIAL_FOOD_SEEDS", 0)
+    monkeypatch.setattr(sharding, "FOOD_SEED_CHANCE", 0.0)
+    monkeypatch.setattr(FoodLayer, "harvest", lambda self, pos, amount: 0.0)
+    world = ShardedWorld(width=40, height=40, tiles=2, seed=23, nests=[(20, 22)], processes=1)
+    for tile in world.hosts[0][0].tiles.values():
+        tile.food.regrowth_chance, tile.food.expansion_chance = 0.0, 1.0
+    world.inboxes[0]["seeds"] = [((20, 19), 1000)]
+    world.run(30)
+    food = world.fields()[1]
+    assert food.sum() == pytest.approx(1000)
+    assert not (food[18:23, 20:25] > 0).any()
+
+
+@pytest.mark.parametrize("height, tiles", [(50, 1), (50, 2), (40, 4), (45, 3)])
+def test_default_nest_fits_in_one_tile(height, tiles):
+    world = ShardedWorld(width=40, height=height, tiles=tiles, processes=1)
+    (cx, cy), = world.nests
+    assert cx == 20 and abs(cy - height // 2) <= sharding.NEST_RADIUS
+    assert sum(len(tile.local_sites) for tile in world.hosts[0][0].tiles.values()) == 1
+
+
+def test_headless_reports_a_bad_nest_as_a_usage_error():
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    result = subprocess.run([sys.executable, "headless.py", "--tiles", "2", "--nest", "25,25", "--steps", "1"],
+                            cwd=root, capture_output=True, text=True)
+    assert result.returncode == 2
+    assert "error: nest at (25, 25)" in result.stderr
+
+
+def test_tiled_world_matches_single_model_statistics():
+    # Three bands over 50 rows keep the default nest at the map center, as in AntColonyModel
+    columns = ["Ants", "Food", "Brood"]
+    single, tiled = [], []
+    for seed in range(100, 106):
+        model = AntColonyModel(seed=seed)
+        for _ in range(800):
+            model.step()
+        single.append(model.datacollector.get_model_vars_dataframe()[columns].iloc[400:].mean())
+        with ShardedWorld(tiles=3, seed=seed, processes=1) as world:
+            world.run(800)
+            tiled.append(world.results()[columns].iloc[400:].mean())
+    single, tiled = pd.DataFrame(single), pd.DataFrame(tiled)
+    error = np.sqrt(single.sem() ** 2 + tiled.sem() ** 2)
+    assert ((single.mean() - tiled.mean()).abs() <= 3 * error).all()